@@ -7,8 +7,12 @@ from pathlib import Path
 
 def export_to_csv(df: pd.DataFrame, filepath: str, sep: str = ",",
                   index: bool = False, columns: Optional[List[str]] = None,
-                  overwrite: bool = False) -> None:
-    """Export a DataFrame to CSV format."""
+                  overwrite: bool = False, chunksize: Optional[int] = None) -> None:
+    """Export a DataFrame to CSV format.
+
+    With `chunksize`, rows are formatted and written `chunksize` at a time
+    instead of as one text buffer, which bounds memory for large frames.
+    """
     if df.empty:
         raise ValueError("Cannot export an empty DataFrame to CSV.")
     path = Path(filepath)
@@ -21,24 +25,42 @@ def export_to_csv(df: pd.DataFrame, filepath: str, sep: str = ",",
         df_to_save = df[columns]
     else:
         df_to_save = df
-    df_to_save.to_csv(filepath, sep=sep, index=index)
+    df_to_save.to_csv(filepath, sep=sep, index=index, chunksize=chunksize)
 
 
 def export_to_numpy(df: pd.DataFrame, filepath: str, columns: Optional[list[str]] = None,
-                    overwrite: bool = False) -> None:
-    """Export a DataFrame to NumPy .npy format."""
+                    overwrite: bool = False) -> str:
+    """Export a DataFrame to NumPy format and return the path written.
+
+    Frames whose columns share one numeric kind (int/float, or all bool)
+    are saved as one 2-D .npy array. Other frames (text, categories, dates,
+    bool mixed with numbers) are saved as an .npz archive with one array per
+    column, so numeric columns are not cast to object; the archive always
+    gets the .npz extension (data.npy -> data.npz). `load_csv` reads both.
+    """
     if df.empty:
         raise ValueError("Cannot export an empty DataFrame to NumPy.")
-    path = Path(filepath)
-    if path.exists() and not overwrite:
-        raise FileExistsError(f"File {filepath} already exists. Set overwrite=True to replace.")
     if columns:
         missing = [col for col in columns if col not in df.columns]
         if missing:
             raise KeyError(f"Columns not found in DataFrame: {missing}")
-        array = df[columns].to_numpy()
-    else:
-        array = df.to_numpy()
-    np.save(filepath, array)
+        df = df[columns]
+
+    path = Path(filepath)
+    kinds = {t.kind if isinstance(t, np.dtype) else "O" for t in df.dtypes}
+    # bool columns next to numbers make df.to_numpy() an object array
+    single_array = path.suffix.lower() != ".npz" and (kinds <= set("iuf") or kinds == {"b"})
+    if not single_array:
+        path = path.with_suffix(".npz")
+    if path.exists() and not overwrite:
+        raise FileExistsError(f"File {path} already exists. Set overwrite=True to replace.")
 
+    if single_array:
+        np.save(path, df.to_numpy(), allow_pickle=False)
+        return str(path)
 
+    # arrays are stored as arr_0, arr_1, ... with their names in `columns`;
+    # column names cannot be keywords of np.savez directly (e.g. "file")
+    arrays = [df.iloc[:, i].to_numpy() for i in range(df.shape[1])]
+    np.savez(path, *arrays, columns=np.array([str(c) for c in df.columns]))
+    return str(path)
@@ -0,0 +1,170 @@
+"""Numba kernels for element-wise column arithmetic.
+
+numba is optional: without it NUMBA_AVAILABLE is False and callers use
+plain numpy instead.
+"""
+import itertools
+from typing import Any, Callable, Dict, Optional
+
+import numpy as np
+
+try:
+    import numba
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+# dtypes the kernels are used for (after processor._widen)
+KERNEL_DTYPES = (np.dtype(np.int64), np.dtype(np.float64))
+
+
+if NUMBA_AVAILABLE:
+    # no fastmath: it assumes there are no NaNs, and missing values are common
+
+    @njit(parallel=True, cache=True)
+    def add(a, b, out):
+        for i in prange(a.size):
+            out[i] = a[i] + b[i]
+
+    @njit(parallel=True, cache=True)
+    def sub(a, b, out):
+        for i in prange(a.size):
+            out[i] = a[i] - b[i]
+
+    @njit(parallel=True, cache=True)
+    def mul(a, b, out):
+        for i in prange(a.size):
+            out[i] = a[i] * b[i]
+
+    @njit(parallel=True, cache=True)
+    def mean(a, b, out):
+        for i in prange(a.size):
+            out[i] = (a[i] + b[i]) / 2
+
+    KERNELS = {"sum": add, "diff": sub, "prod": mul, "mean": mean}
+
+    @njit(parallel=True)
+    def _map(func, values, out):
+        for i in prange(values.size):
+            out[i] = func(values[i])
+else:
+    KERNELS = {}
+
+
+# jitted user functions keyed by (code, closure values, defaults);
+# None marks functions numba cannot compile
+_JIT_CACHE: Dict[tuple, Any] = {}
+
+
+def binary(op: str, a: np.ndarray, b: np.ndarray):
+    """Run the kernel for `op` on two 1-D arrays.
+
+    Returns None when numba is missing or the dtypes are not supported.
+    """
+    kernel = KERNELS.get(op)
+    if kernel is None or a.dtype not in KERNEL_DTYPES or b.dtype not in KERNEL_DTYPES:
+        return None
+    dtype = np.result_type(a, b, np.float64) if op == "mean" else np.result_type(a, b)
+    out = np.empty(a.size, dtype=dtype)
+    kernel(a, b, out)
+    return out
+
+
+def _cache_key(func: Callable) -> Optional[tuple]:
+    try:
+        closure = tuple(cell.cell_contents for cell in func.__closure__ or ())
+        key = (func.__code__, closure, func.__defaults__)
+        hash(key)
+    except (AttributeError, TypeError, ValueError):
+        # wbudowane funkcje, niehashowalne domknięcia - bez cache
+        return None
+    return key
+
+
+def map_values(func: Callable, values: np.ndarray) -> Optional[np.ndarray]:
+    """Apply a scalar function to every element of a numeric array with numba.
+
+    Returns None when numba is missing, the array is empty or not numeric,
+    `func` cannot be compiled in nopython mode, or the compiled loop would
+    not give what Series.apply gives (another result dtype, integer
+    overflow, negative powers of integers); callers then fall back to
+    Series.apply. Globals used by `func` are frozen at its first compile.
+    """
+    if not NUMBA_AVAILABLE or values.size == 0 or values.dtype.kind not in "biuf":
+        return None
+
+    key = _cache_key(func)
+    jitted = _JIT_CACHE.get(key) if key is not None else None
+    if jitted is None and key is not None and key in _JIT_CACHE:
+        return None
+
+    try:
+        if jitted is None:
+            jitted = njit(func)
+        # typ wyniku ustalamy na pierwszym elemencie (kompiluje funkcję)
+        first = np.asarray(jitted(values[0]))
+        if first.ndim != 0 or first.dtype.kind not in "biufc":
+            raise TypeError("function does not return a number")
+        out = np.empty(values.size, dtype=first.dtype)
+        _map(jitted, values, out)
+    except Exception:
+        # np. TypingError - funkcja nie kompiluje się w trybie nopython,
+        # albo funkcje wbudowane, których njit nie przyjmuje
+        jitted = None
+        out = None
+
+    if key is not None:
+        _JIT_CACHE[key] = jitted
+    if out is None or not _matches_python(func, jitted, values, out):
+        return None
+    return out
+
+
+def _matches_python(func: Callable, jitted, values: np.ndarray, out: np.ndarray) -> bool:
+    """Check the compiled result against the Python semantics of Series.apply."""
+    try:
+        # Series.apply przekazuje skalary Pythona (int, float, bool)
+        expected = np.asarray(func(values[0].item()))
+    except Exception:
+        return False
+    if expected.dtype != out.dtype:
+        return False
+    if out.dtype.kind in "iu" and values.dtype.kind in "biu":
+        # liczby całkowite w numba przekręcają się przy przepełnieniu,
+        # a x ** -1 daje 0 - ta sama pętla na float64 to wykrywa
+        check = np.empty(values.size, dtype=np.float64)
+        try:
+            _map(jitted, values.astype(np.float64), check)
+        except Exception:
+            return False
+        return bool(np.allclose(out, check, rtol=1e-9, atol=0))
+    return True
+
+
+def launch_threads():
+    """Start numba's parallel worker threads from the calling thread.
+
+    Call on the main thread before the kernels are first used (or compiled)
+    from another thread: a Qt application whose numba threads were started
+    by a worker thread hangs at exit.
+    """
+    if NUMBA_AVAILABLE:
+        numba.get_num_threads()
+
+
+def warmup():
+    """Compile (or load from cache) every kernel for the supported dtypes.
+
+    Only compiles, nothing is run: the kernels are parallel, and numba's
+    workqueue threading layer aborts the process when two threads run
+    parallel code at once (warmup runs next to the GUI thread).
+    """
+    if not NUMBA_AVAILABLE:
+        return
+    for a, b in itertools.product(KERNEL_DTYPES, repeat=2):
+        for op, kernel in KERNELS.items():
+            # typ wyniku jak w binary(); tablice 1-D, ciągłe (C)
+            out = np.result_type(a, b, np.float64) if op == "mean" else np.result_type(a, b)
+            kernel.compile(tuple(numba.from_dtype(t)[::1] for t in (a, b, out)))
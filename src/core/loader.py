@@ -1,6 +1,34 @@
-from typing import Optional, Dict, List
+import csv
+import itertools
+from typing import Any, Callable, Optional, Dict, List, Union
 import pandas as pd
 import numpy as np
+from pandas._libs.parsers import STR_NA_VALUES
+
+from src.core.processor import filter_rows
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.csv as pacsv
+except ImportError:
+    pa = None
+    pc = None
+    pacsv = None
+
+
+# bytes per block parsed by one pyarrow thread
+ARROW_BLOCK_SIZE = 4 << 20
+
+# rows per chunk when load_csv filters rows with the pandas parser
+FILTER_CHUNK_ROWS = 100_000
+
+# pandas' default NA markers ("", "NA", "NaN", "None", "<NA>", ...) for pyarrow
+_ARROW_NULLS = sorted(STR_NA_VALUES)
+
+# integers from this magnitude do not fit int64; pyarrow reads them as
+# float64, pandas as uint64 or text
+_INT64_LIMIT = 2.0 ** 63
 
 
 def load_csv(
@@ -9,40 +37,86 @@ def load_csv(
         header: Optional[int] = 0,
         encoding: str = "utf-8",
         na_values: Optional[List[str]] = None,
-        npy_columns: Optional[List[str]] = None
+        npy_columns: Optional[List[str]] = None,
+        engine: Optional[str] = None,
+        nrows: Optional[int] = None,
+        dtype: Optional[Dict[str, str]] = None,
+        usecols: Optional[List[str]] = None,
+        parse_dates: Optional[List[str]] = None,
+        row_filter: Union[Callable, str, Any, None] = None
 ) -> pd.DataFrame:
-    """Load a CSV or NPY file into a pandas DataFrame."""
-    try:
-        # --- OBSŁUGA NPY ----------------------------------------------------
-        if filepath.lower().endswith(".npy"):
+    """Load a CSV, NPY or NPZ file into a pandas DataFrame.
 
-            # ⬇⬇⬇ KLUCZOWA POPRAWKA ⬇⬇⬇
-            try:
-                arr = np.load(filepath, allow_pickle=False)
-            except ValueError:
-                # object dtype → fallback
-                arr = np.load(filepath, allow_pickle=True)
+    `engine`, `nrows`, `dtype`, `usecols` and `parse_dates` are passed to
+    `pd.read_csv` (CSV only); engine is "c", "python" or "pyarrow" (None
+    keeps the pandas default, pyarrow does not support nrows). Columns left
+    out of `usecols` are never converted or stored. engine="auto" uses
+    pyarrow's multithreaded reader when pyarrow is installed and the options
+    allow it, and the pandas default parser otherwise or when pyarrow
+    rejects the file.
 
-            if arr.size == 0:
-                raise ValueError("NPY file is empty")
+    `row_filter` keeps only matching rows while reading: a condition as for
+    processor.filter_rows (expression string or function of the frame),
+    applied to each chunk read (FILTER_CHUNK_ROWS rows with the pandas
+    parser, ARROW_BLOCK_SIZE bytes with pyarrow), or a pyarrow.compute
+    Expression (e.g. `pc.field("age") > 30`, pyarrow reader only) applied
+    before the conversion to pandas. The result gets a new 0..n-1 index.
+    """
+    try:
+        # --- OBSŁUGA NPY / NPZ -----------------------------------------------
+        if filepath.lower().endswith((".npy", ".npz")):
+            return _load_numpy(filepath, npy_columns)
 
-            if arr.ndim == 1:
-                arr = arr.reshape(-1, 1)
+        # --- OBSŁUGA CSV ---------------------------------------------------
+        arrow_filter = pc is not None and isinstance(row_filter, pc.Expression)
+        if (
+            engine in ("pyarrow", "auto") and pacsv is not None and header == 0
+            and encoding.lower().replace("-", "") == "utf8" and nrows is None
+            and all(t == "category" for t in (dtype or {}).values())
+            and parse_dates is None
+        ):
+            try:
+                df = _read_csv_arrow(filepath, sep, dtype, na_values, usecols, row_filter)
+            except (pa.ArrowInvalid, pa.ArrowKeyError):
+                if engine == "pyarrow" or arrow_filter:
+                    raise
+                # np. nieregularne wiersze, brak kolumny z usecols -
+                # zwykły parser pandas poniżej
+                df = None
+            if df is not None:
+                if df.empty and row_filter is None:
+                    raise ValueError("CSV file is empty")
+                return df
+            # dalej parser C - pd.read_csv(engine="pyarrow") zgubiłby te same cyfry
+            engine = None
 
-            if npy_columns and len(npy_columns) != arr.shape[1]:
-                raise ValueError("Number of columns does not match array shape")
+        if arrow_filter:
+            raise ValueError(
+                "pyarrow row_filter expressions need the pyarrow reader "
+                "(engine='pyarrow' or 'auto', header=0, UTF-8, no nrows)"
+            )
 
-            return pd.DataFrame(arr, columns=npy_columns)
+        if engine == "auto":
+            engine = None
 
-        # --- OBSŁUGA CSV ---------------------------------------------------
         df = pd.read_csv(
             filepath,
             sep=sep,
             header=header,
             encoding=encoding,
-            na_values=na_values
+            na_values=na_values,
+            engine=engine,
+            nrows=nrows,
+            dtype=dtype,
+            usecols=usecols,
+            parse_dates=parse_dates,
+            # z filtrem plik czytamy partiami, odrzucone wiersze nie są trzymane
+            chunksize=FILTER_CHUNK_ROWS if row_filter is not None else None
         )
 
+        if row_filter is not None:
+            return _filter_chunks(df, row_filter)
+
         if df.empty:
             raise ValueError("CSV file is empty")
 
@@ -54,7 +128,253 @@ def load_csv(
         raise ValueError("CSV file is empty")
     except pd.errors.ParserError as e:
         raise ValueError(f"Error parsing CSV file: {e}")
+    except Exception as e:
+        if pa is not None and isinstance(e, (pa.ArrowInvalid, pa.ArrowKeyError)):
+            if str(e).startswith("Empty CSV file"):
+                raise ValueError("CSV file is empty")
+            raise ValueError(f"Error parsing CSV file: {e}")
+        raise
+
+
+def _filter_chunks(reader, row_filter: Union[Callable, str]) -> pd.DataFrame:
+    """Concatenate the rows of each chunk that pass `row_filter`."""
+    parts, rows = [], 0
+    with reader:
+        for chunk in reader:
+            rows += len(chunk)
+            parts.append(filter_rows(chunk, row_filter))
+    if rows == 0:
+        raise ValueError("CSV file is empty")
+    return pd.concat(parts, ignore_index=True)
+
+
+def load_csv_projected(filepath: str, columns: List[str], **kwargs) -> pd.DataFrame:
+    """Load only `columns` of a CSV file (load_csv with usecols=columns).
+
+    Cheaper than loading the whole file and dropping the rest afterwards.
+    """
+    return load_csv(filepath, usecols=columns, **kwargs)
+
+
+
+def _read_csv_arrow(
+        filepath: str,
+        sep: str,
+        dtype: Optional[Dict[str, str]],
+        na_values: Optional[List[str]] = None,
+        usecols: Optional[List[str]] = None,
+        row_filter: Any = None
+) -> pd.DataFrame:
+    """Parse a CSV with pyarrow directly, in ARROW_BLOCK_SIZE blocks.
+
+    Used by load_csv for engine="pyarrow"/"auto" when no option needs pandas;
+    pd.read_csv(engine="pyarrow") keeps pyarrow's 1 MB default block size.
+    Column names, NA markers and dtypes follow pd.read_csv: repeated or
+    blank headers are renamed, date/time columns stay text (no parse_dates)
+    and all-empty columns are float64. Returns None when the file needs
+    the pandas parser (integers beyond int64).
+    """
+    with open(filepath, newline="", encoding="utf-8-sig") as fh:
+        header = next(csv.reader(fh, delimiter=sep), [])
+    names = _dedup_names(header)
+
+    read_options = pacsv.ReadOptions(block_size=ARROW_BLOCK_SIZE, use_threads=True)
+    if names != header:
+        # powtórzone nagłówki: nazwy jak w pandas (a, a.1, ...)
+        read_options = pacsv.ReadOptions(
+            block_size=ARROW_BLOCK_SIZE, use_threads=True,
+            column_names=names, skip_rows=1
+        )
+    parse_options = pacsv.ParseOptions(delimiter=sep)
+
+    if usecols is not None:
+        # pandas zwraca kolumny w kolejności z pliku, pyarrow - z include_columns
+        order = {col: i for i, col in enumerate(names)}
+        usecols = sorted(usecols, key=lambda col: order.get(col, len(order)))
+
+    convert = dict(
+        # puste pola tekstowe jako NaN, tak jak w parserze pandas;
+        # na_values uzupełniają domyślną listę, jak w pd.read_csv
+        strings_can_be_null=True,
+        null_values=_ARROW_NULLS + list(na_values or []),
+        include_columns=usecols,
+    )
+    column_types = {col: pa.dictionary(pa.int32(), pa.string()) for col in (dtype or {})}
+
+    # pyarrow rozpoznaje daty i czasy, pandas bez parse_dates zostawia tekst;
+    # typy ustalane są z pierwszego bloku, więc wystarczy go odczytać
+    with pacsv.open_csv(
+        filepath, read_options=read_options, parse_options=parse_options,
+        convert_options=pacsv.ConvertOptions(column_types=column_types, **convert)
+    ) as reader:
+        schema = reader.schema
+    for field in schema:
+        if pa.types.is_temporal(field.type):
+            column_types[field.name] = pa.string()
+
+    convert_options = pacsv.ConvertOptions(column_types=column_types, **convert)
+
+    if row_filter is not None and not isinstance(row_filter, pc.Expression):
+        # warunek pandas: plik czytany blokami, w pamięci tylko pasujące wiersze
+        return _filter_batches(
+            pacsv.open_csv(
+                filepath, read_options=read_options, parse_options=parse_options,
+                convert_options=convert_options
+            ),
+            row_filter
+        )
+
+    table = pacsv.read_csv(
+        filepath,
+        read_options=read_options,
+        parse_options=parse_options,
+        convert_options=convert_options,
+    )
+    if row_filter is not None:
+        if table.num_rows == 0:
+            raise ValueError("CSV file is empty")
+        # filtr na tabeli Arrow - odrzucone wiersze nie są konwertowane
+        table = table.filter(row_filter)
+    return _arrow_to_pandas(table, check_ints=row_filter is None)
+
+
+def _filter_batches(reader, row_filter: Union[Callable, str]) -> pd.DataFrame:
+    """Keep the rows of each pyarrow record batch that pass `row_filter`."""
+    kept, rows = [], 0
+    with reader:
+        for batch in reader:
+            rows += batch.num_rows
+            # indeks 0..n-1 partii = numery pasujących wierszy
+            passed = filter_rows(batch.to_pandas(), row_filter)
+            kept.append(batch.take(pa.array(passed.index.to_numpy())))
+        schema = reader.schema
+    if rows == 0:
+        raise ValueError("CSV file is empty")
+    # jedna tabela: kolumny słownikowe dostają wspólne kategorie
+    return _arrow_to_pandas(pa.Table.from_batches(kept, schema=schema))
+
+
+def _arrow_to_pandas(table, check_ints: bool = True) -> Optional[pd.DataFrame]:
+    """Convert a parsed table to the dtypes pd.read_csv would give.
+
+    Returns None when a float column holds integers beyond int64 (pyarrow
+    parses them as float64, losing digits); load_csv then uses pandas.
+    """
+    # kolumny bez żadnej wartości: pandas daje float64 z NaN, pyarrow - None
+    for i, field in enumerate(table.schema):
+        if pa.types.is_null(field.type):
+            table = table.set_column(i, field.name, table.column(i).cast(pa.float64()))
+    # kolumny słownikowe stają się pd.Categorical
+    df = table.to_pandas()
+    if check_ints:
+        for col in df.columns[(df.dtypes == np.float64).to_numpy()]:
+            values = df[col].to_numpy()
+            big = np.isfinite(values) & (np.abs(values) >= _INT64_LIMIT)
+            if big.any() and (values[big] == np.floor(values[big])).all():
+                return None
+    return df
+
+
+def _dedup_names(names: List[str]) -> List[str]:
+    """Name columns the way pd.read_csv does (a, a.1, a.2; blank: Unnamed: i)."""
+    # puste nazwy jak w pandas: "Unnamed: <pozycja>"
+    names = [col if col else f"Unnamed: {i}" for i, col in enumerate(names)]
+    # jak parser C: nowa nazwa nie może powtórzyć żadnej nazwy z nagłówka
+    taken = set(names)
+    counts: Dict[str, int] = {}
+    result = []
+    for col in names:
+        base, count = col, counts.get(col, 0)
+        while count > 0:
+            counts[base] = count + 1
+            col = f"{base}.{count}"
+            count = count + 1 if col in taken else counts.get(col, 0)
+        result.append(col)
+        counts[col] = counts.get(col, 0) + 1
+    return result
+
+
+def _read_numpy(filepath: str, allow_pickle: bool):
+    """Return (2-D array, None) for .npy or (column arrays, names) for .npz."""
+    data = np.load(filepath, allow_pickle=allow_pickle)
+    if not isinstance(data, np.lib.npyio.NpzFile):
+        return data, None
+    with data:
+        if "columns" in data.files:
+            # układ zapisywany przez export_to_numpy: arr_0, arr_1, ... + nazwy
+            names = data["columns"].tolist()
+            return [data[f"arr_{i}"] for i in range(len(names))], names
+        return [data[key] for key in data.files], list(data.files)
+
+
+def _load_numpy(filepath: str, npy_columns: Optional[List[str]]) -> pd.DataFrame:
+    try:
+        arr, names = _read_numpy(filepath, allow_pickle=False)
+    except ValueError:
+        # object dtype → fallback
+        arr, names = _read_numpy(filepath, allow_pickle=True)
+
+    if names is not None:
+        if not arr or arr[0].size == 0:
+            raise ValueError("NPZ file is empty")
+        if npy_columns and len(npy_columns) != len(arr):
+            raise ValueError("Number of columns does not match array shape")
+        df = pd.DataFrame(dict(enumerate(arr)))
+        df.columns = npy_columns or names
+        return df
+
+    if arr.size == 0:
+        raise ValueError("NPY file is empty")
+
+    if arr.ndim == 1:
+        arr = arr.reshape(-1, 1)
 
+    if npy_columns and len(npy_columns) != arr.shape[1]:
+        raise ValueError("Number of columns does not match array shape")
+
+    return pd.DataFrame(arr, columns=npy_columns)
+
+
+def optimize_dtypes(
+        df: pd.DataFrame,
+        min_rows: int = 10_000,
+        category_ratio: float = 0.5
+) -> pd.DataFrame:
+    """Shrink column dtypes of a freshly loaded DataFrame (in place).
+
+    Integers are downcast to the narrowest type that holds them, floats to
+    float32 only when no value changes, and text columns with fewer than
+    `category_ratio` unique values per row become categories. Frames with
+    `min_rows` rows or fewer are returned unchanged.
+    """
+    if len(df) <= min_rows:
+        return df
+
+    for i in range(df.shape[1]):
+        col = df.iloc[:, i]
+        dtype = col.dtype
+        if not isinstance(dtype, np.dtype):
+            continue
+
+        if dtype.kind == "i":
+            df.isetitem(i, pd.to_numeric(col, downcast="signed"))
+        elif dtype.kind == "u":
+            df.isetitem(i, pd.to_numeric(col, downcast="unsigned"))
+        elif dtype.kind == "f" and dtype.itemsize > 4:
+            values = col.to_numpy()
+            small = values.astype(np.float32)
+            if np.array_equal(small, values, equal_nan=True):
+                df.isetitem(i, small)
+        elif dtype.kind == "O":
+            try:
+                unique = col.nunique()
+            except TypeError:
+                # niehashowalne obiekty (np. z pliku .npy)
+                continue
+            if unique / len(col) < category_ratio:
+                df.isetitem(i, col.astype("category"))
+
+    return df
 
 
 def preview_dataframe(
@@ -73,39 +393,62 @@ def preview_dataframe(
 
 
 def get_dataframe_stat_summary(df: pd.DataFrame) -> Dict[str, object]:
-    """Return summary statistics and structure of a DataFrame."""
+    """Return summary statistics and structure of a DataFrame.
+
+    `memory_bytes` counts the column buffers only (no deep scan of Python
+    strings), so it stays cheap on large frames.
+    """
     return {
         "row_count": df.shape[0],
         "column_count": df.shape[1],
-        "missing_values": df.isna().sum().to_dict()
+        "missing_values": df.isna().sum().to_dict(),
+        "memory_bytes": int(df.memory_usage(index=True, deep=False).sum())
     }
     
 
 def set_column_names(df: pd.DataFrame, names: List[str]) -> pd.DataFrame:
-    """Manually set column names in a DataFrame."""
+    """Return `df` with new column names; the input frame is left as is.
+
+    The result is a shallow copy: only the column axis is new, the column
+    data is shared with `df`.
+    """
+    names = pd.Index(names)
     if df.shape[1] != len(names):
         raise ValueError("Number of names doesn't match")
-    df.columns = names 
-    return df
+    out = df.copy(deep=False)
+    out.columns = names
+    return out
+
 
+def validate_csv_format(
+        filepath: str,
+        expected_cols: Optional[int] = None,
+        sep: str = ",",
+        max_rows_to_check: Optional[int] = None
+) -> bool:
+    """Check basic integrity of a CSV file before loading.
 
-def validate_csv_format(filepath: str, expected_cols: Optional[int] = None) -> bool:
-    """Check basic integrity of a CSV file before loading."""
+    Rows are streamed with `csv.reader` (quoted separators are not counted)
+    and checking stops at the first bad row, or after `max_rows_to_check`
+    data rows when given. Without `expected_cols` only the header is read.
+    """
     try:
-        with open(filepath, "r", encoding="utf-8") as f:
-            first_line = f.readline().strip()
-            if not first_line:
+        with open(filepath, "r", encoding="utf-8", newline="") as f:
+            reader = csv.reader(f, delimiter=sep)
+            header = next(reader, None)
+            if not header:
                 raise ValueError("CSV file is empty")
 
-            cols = first_line.split(",")
-            if expected_cols is not None and len(cols) != expected_cols:
+            if expected_cols is None:
+                return True
+            if len(header) != expected_cols:
                 raise ValueError("Wrong number of columns")
 
-            for line in f:
-                values = line.strip().split(",")
-                if expected_cols is not None and len(values) != expected_cols:
+            for row in itertools.islice(reader, max_rows_to_check):
+                # puste linie pomija też pd.read_csv
+                if row and len(row) != expected_cols:
                     raise ValueError(
-                        f"Inconsistent column number in row: {line.strip()}"
+                        f"Inconsistent column number in row: {sep.join(row)}"
                     )
 
         return True
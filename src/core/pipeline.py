@@ -0,0 +1,144 @@
+"""Lazy chains of processor operations.
+
+    (Pipeline(df)
+        .add_column_from_expression("c", "a + b")
+        .apply_transformation("a", func)
+        .filter_rows("b > 0")
+        .drop_columns(["c"])
+        .collect())
+
+records the steps and runs them at collect() on a single copy of the frame.
+Columns dropped by a later step are left out of that copy, steps that only
+produce dropped columns are skipped, and row filters that do not read a
+transformed column run before the transformation.
+"""
+import ast
+from typing import Callable, FrozenSet, List, Optional, Tuple, Union
+
+import pandas as pd
+
+from src.core import processor
+
+
+# step: (kind, args, reads, writes); reads=None means "any column"
+_ROW_FILTERS = ("filter_rows", "drop_rows_by_condition")
+
+
+def _expression_names(expression: str) -> Optional[FrozenSet[str]]:
+    """Names an expression string refers to, or None if it cannot be parsed."""
+    try:
+        tree = ast.parse(expression, mode="eval")
+    except SyntaxError:
+        # np. `kolumna ze spacją` albo @zmienna - składnia tylko dla df.eval
+        return None
+    return frozenset(node.id for node in ast.walk(tree) if isinstance(node, ast.Name))
+
+
+def _predicate_names(condition: Union[Callable, str]) -> Optional[FrozenSet[str]]:
+    return _expression_names(condition) if isinstance(condition, str) else None
+
+
+class Pipeline:
+    """Record processor operations on a DataFrame and run them together."""
+
+    def __init__(self, df: pd.DataFrame):
+        self._df = df
+        self._steps: List[tuple] = []
+
+    def _add(self, kind, args, reads, writes) -> "Pipeline":
+        self._steps.append((kind, args, reads, writes))
+        return self
+
+    # --- recorded operations -------------------------------------------------
+
+    def drop_columns(self, columns: List[str]) -> "Pipeline":
+        return self._add("drop_columns", (list(columns),), frozenset(), None)
+
+    def add_column(self, name: str, values: List) -> "Pipeline":
+        return self._add("add_column", (name, values), frozenset(), name)
+
+    def add_column_from_expression(self, new_name: str, expression: str) -> "Pipeline":
+        return self._add(
+            "add_column_from_expression", (new_name, expression),
+            _expression_names(expression), new_name
+        )
+
+    def apply_transformation(
+        self, column: str, func: Callable, engine: Optional[str] = None
+    ) -> "Pipeline":
+        return self._add(
+            "apply_transformation", (column, func, engine), frozenset([column]), column
+        )
+
+    def filter_rows(self, condition: Union[Callable, str]) -> "Pipeline":
+        return self._add("filter_rows", (condition,), _predicate_names(condition), None)
+
+    def drop_rows_by_condition(self, condition: Union[Callable, str]) -> "Pipeline":
+        return self._add(
+            "drop_rows_by_condition", (condition,), _predicate_names(condition), None
+        )
+
+    # --- execution -----------------------------------------------------------
+
+    def _check_columns(self):
+        """Raise the KeyErrors the eager calls would raise, before any work."""
+        columns = set(self._df.columns)
+        for kind, args, _, writes in self._steps:
+            if kind == "drop_columns":
+                missing = [col for col in args[0] if col not in columns]
+                if missing:
+                    raise KeyError(f"Columns not found in DataFrame: {missing}")
+                columns.difference_update(args[0])
+            elif kind == "apply_transformation" and args[0] not in columns:
+                raise KeyError(f"Column '{args[0]}' not found in DataFrame.")
+            elif writes is not None:
+                columns.add(writes)
+
+    def _plan(self) -> Tuple[List[tuple], List[str]]:
+        """Return the steps to run and the input columns that are never needed."""
+        steps = list(self._steps)
+
+        # row filters first: a filter may pass a transformation that does
+        # not touch the columns it reads (transformations are element-wise)
+        for i in range(1, len(steps)):
+            j = i
+            while (
+                j > 0 and steps[j][0] in _ROW_FILTERS and steps[j][2] is not None
+                and steps[j - 1][0] == "apply_transformation"
+                and steps[j - 1][3] not in steps[j][2]
+            ):
+                steps[j - 1], steps[j] = steps[j], steps[j - 1]
+                j -= 1
+
+        # walking backwards, `dead` holds columns dropped later and not read
+        # in between; steps writing only such a column are skipped
+        plan, dead = [], set()
+        for step in reversed(steps):
+            kind, args, reads, writes = step
+            if kind == "drop_columns":
+                dead.update(args[0])
+            elif writes is not None and writes in dead:
+                continue
+            if reads is None:
+                dead.clear()
+            else:
+                dead.difference_update(reads)
+            plan.append(step)
+        plan.reverse()
+        return plan, [col for col in self._df.columns if col in dead]
+
+    def collect(self) -> pd.DataFrame:
+        """Run the recorded steps and return the result (the input is not modified)."""
+        self._check_columns()
+        plan, unused = self._plan()
+
+        # the only full copy; columns nobody reads before dropping them are not copied
+        df = self._df.drop(columns=unused) if unused else self._df.copy()
+        for kind, args, _, _ in plan:
+            if kind == "drop_columns":
+                for col in args[0]:
+                    if col in df.columns:
+                        del df[col]
+            else:
+                df = getattr(processor, kind)(df, *args)
+        return df
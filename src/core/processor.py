@@ -1,6 +1,86 @@
+import ast
+import warnings
+
 import pandas as pd
 import numpy as np
-from typing import List, Callable, Dict, Union
+from typing import Any, List, Callable, Dict, Optional, Union
+from pandas.core.groupby import DataFrameGroupBy
+
+from src.core import kernels
+
+try:
+    import numexpr
+    from numexpr.necompiler import getExprNames, getType
+except ImportError:
+    numexpr = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:
+    pa = None
+    pc = None
+
+
+# numexpr programs keyed by (expression, ((column, dtype), ...));
+# None marks expressions numexpr cannot compile
+_EXPR_CACHE: Dict[tuple, Any] = {}
+# expression -> (input names, uses integer-sensitive operators), or None
+# when numexpr should not run it
+_EXPR_NAMES: Dict[str, Any] = {}
+
+# functions DataFrame.eval knows; numexpr has more (e.g. where), which must
+# keep failing as in pandas
+_EVAL_FUNCS = frozenset({
+    "sin", "cos", "tan", "exp", "log", "expm1", "log1p", "sqrt", "sinh", "cosh",
+    "tanh", "arcsin", "arccos", "arctan", "arccosh", "arcsinh", "arctanh", "abs",
+    "arctan2",
+})
+
+
+# math_operation fallbacks (ufuncs keep Series alignment and nullable dtypes)
+_MATH_OPS: Dict[str, Callable] = {
+    "sum": np.add,
+    "diff": np.subtract,
+    "prod": np.multiply,
+    "mean": lambda a, b: np.add(a, b) / 2,
+}
+
+# filter_text modes: (Series.str accessor, pattern, regex) -> boolean mask
+_STR_OPS: Dict[str, Callable] = {
+    "contains": lambda s, p, regex: s.contains(p, regex=regex, na=False),
+    "startswith": lambda s, p, regex: s.startswith(p, na=False),
+    "endswith": lambda s, p, regex: s.endswith(p, na=False),
+}
+# the same modes as pyarrow.compute kernels (literal patterns only)
+_ARROW_STR_OPS: Dict[str, str] = {
+    "contains": "match_substring",
+    "startswith": "starts_with",
+    "endswith": "ends_with",
+}
+
+# groupby reductions that accept engine="numba"
+_ENGINE_AGGS = frozenset({"sum", "mean", "min", "max", "var", "std"})
+
+# built-in rolling aggregations accepted by rolling_stat
+_ROLLING_FUNCS = frozenset({"mean", "sum", "min", "max", "median", "std", "var"})
+
+
+# --- Helpers -----------------------------------------------------------------
+
+def _wide_dtype(dtype):
+    """Return the 64-bit counterpart of a narrow numpy int/float dtype."""
+    if isinstance(dtype, np.dtype) and dtype.itemsize < 8:
+        if dtype.kind in "iu":
+            return np.dtype(np.int64)
+        if dtype.kind == "f":
+            return np.dtype(np.float64)
+    return dtype
+
+
+def _widen(values):
+    """Upcast narrow numeric data (see loader.optimize_dtypes) before arithmetic."""
+    return values.astype(_wide_dtype(values.dtype), copy=False)
 
 
 # --- Column operations -------------------------------------------------------
@@ -29,6 +109,9 @@ def add_column(df: pd.DataFrame, name: str, values: List) -> pd.DataFrame:
         df[name] = values[:n]
         return df
 
+    df[name] = values
+    return df
+
 def add_column_from_expression(
     df: pd.DataFrame,
     new_name: str,
@@ -38,29 +121,141 @@ def add_column_from_expression(
     Create new column using pandas expression.
     Example expression: "(A + B) / 2"
     """
+    compiled = _compile_expression(df, expression)
+    if compiled is not None:
+        program, names = compiled
+        try:
+            result = program(*[_widen(df[name].to_numpy()) for name in names])
+        except Exception:
+            # numexpr refused the inputs at run time - same as eval below
+            result = None
+        if result is not None:
+            df[new_name] = result
+            return df
+
     try:
         # allow numpy as np
         local_ctx = {"np": np}
-        df[new_name] = df.eval(expression, engine="python", local_dict=local_ctx)
+        narrow = {
+            c: _widen(df[c]) for c in df.columns
+            if isinstance(c, str) and _wide_dtype(df[c].dtype) != df[c].dtype
+        }
+        df[new_name] = df.eval(
+            expression, engine="python", local_dict=local_ctx, resolvers=(narrow,)
+        )
         return df
     except Exception as e:
         raise ValueError(f"Invalid expression: {e}")
 
 
+def _parse_expression(expression: str):
+    """Return (input names, uses //, % or abs) for numexpr, or None."""
+    try:
+        names = tuple(getExprNames(expression, {})[0])
+        tree = ast.parse(expression, mode="eval")
+    except Exception:
+        return None
+    if not names:
+        return None
+    int_sensitive = False
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Call):
+            func = node.func.id if isinstance(node.func, ast.Name) else None
+            if func not in _EVAL_FUNCS:
+                return None
+            int_sensitive |= func == "abs"
+        elif isinstance(node, ast.BinOp) and isinstance(node.op, (ast.FloorDiv, ast.Mod)):
+            int_sensitive = True
+    return names, int_sensitive
+
+
+def _compile_expression(df: pd.DataFrame, expression: str):
+    """Return a cached numexpr program and its input columns, or None.
+
+    None means the expression has to go through `DataFrame.eval` (numexpr
+    missing, non-numeric columns, names or syntax numexpr does not know).
+    """
+    if numexpr is None:
+        return None
+
+    if expression not in _EXPR_NAMES:
+        _EXPR_NAMES[expression] = _parse_expression(expression)
+    if _EXPR_NAMES[expression] is None:
+        return None
+    names, int_sensitive = _EXPR_NAMES[expression]
+
+    signature = []
+    for name in names:
+        if name not in df.columns:
+            return None
+        dtype = df[name].dtype
+        if not isinstance(dtype, np.dtype) or dtype.kind not in "biufc":
+            return None
+        # numexpr keeps //, % and abs() on integers integral (1 // 0 -> 0),
+        # pandas goes through float (inf, NaN) or keeps abs() integral
+        if int_sensitive and dtype.kind in "biu":
+            return None
+        # numexpr has no uint64 (it casts to int64 and refuses the input)
+        if dtype.kind == "u" and dtype.itemsize == 8:
+            return None
+        signature.append((name, _wide_dtype(dtype).str))
+
+    key = (expression, tuple(signature))
+    if key not in _EXPR_CACHE:
+        try:
+            program = numexpr.NumExpr(
+                expression,
+                [(name, getType(np.empty(0, dtype))) for name, dtype in signature]
+            )
+        except Exception:
+            program = None
+        _EXPR_CACHE[key] = program
+    program = _EXPR_CACHE[key]
+    return None if program is None else (program, names)
+
+
 def create_column_from_existing(
     df: pd.DataFrame, 
     new_name: str, 
-    func: Callable[[pd.Series], pd.Series]
+    func: Optional[Callable[[pd.Series], pd.Series]] = None,
+    expr: Optional[str] = None
 ) -> pd.DataFrame:
-    """Create a new column based on existing ones using a function."""
+    """Create a new column based on existing ones using a function.
+
+    Arithmetic can be given as a string instead (`expr="a + b * c"`); it is
+    evaluated by add_column_from_expression as one numexpr loop, without
+    the temporary Series a lambda creates for every operator.
+    """
+    if expr is not None:
+        return add_column_from_expression(df, new_name, expr)
+    if func is None:
+        raise ValueError("Either func or expr must be given.")
     df[new_name] = func(df)
     return df
 
 
-def apply_transformation(df: pd.DataFrame, column: str, func: Callable) -> pd.DataFrame:
-    """Apply a transformation function to a column."""
+def apply_transformation(
+    df: pd.DataFrame,
+    column: str,
+    func: Callable,
+    engine: Optional[str] = None
+) -> pd.DataFrame:
+    """Apply a transformation function to a column.
+
+    With engine="numba", numeric columns run `func` as a compiled loop;
+    functions numba cannot compile fall back to the default path.
+    """
     if column not in df.columns:
         raise KeyError(f"Column '{column}' not found in DataFrame.")
+    if engine == "numba":
+        dtype = df[column].dtype
+        if isinstance(dtype, np.dtype):
+            result = kernels.map_values(func, _widen(df[column].to_numpy()))
+            if result is not None:
+                df[column] = result
+                return df
+    elif engine is not None:
+        raise ValueError(f"Unsupported engine: {engine}")
     df[column] = df[column].apply(func)
     return df
 
@@ -69,26 +264,70 @@ def apply_transformation(df: pd.DataFrame, column: str, func: Callable) -> pd.Da
 
 def drop_rows_by_index(df: pd.DataFrame, indexes: List[int]) -> pd.DataFrame:
     """Drop rows by index."""
-    return df.drop(index=indexes)
+    if isinstance(df.index, pd.MultiIndex):
+        # labels of the first level, as df.drop takes them
+        return df.drop(indexes)
+    # one membership mask; a repeated label drops every row carrying it
+    missing = pd.Index(indexes).difference(df.index)
+    if len(missing):
+        raise KeyError(f"Index labels not found: {missing.tolist()}")
+    return df.iloc[~df.index.isin(indexes)]
+
+
+def _row_mask(df: pd.DataFrame, predicate: Union[Callable, str]) -> pd.Series:
+    """Evaluate a row predicate as one boolean mask over the whole frame.
+
+    `predicate` is an expression string for `DataFrame.eval` or a function
+    of the DataFrame returning a boolean Series (`lambda df: df["a"] > 1`).
+    Functions that only work on single rows are still applied row by row,
+    with a DeprecationWarning.
+    """
+    if isinstance(predicate, str):
+        return df.eval(predicate)
 
+    try:
+        mask = predicate(df)
+    except Exception:
+        mask = None
+    # wynik musi być maską wierszy, a nie np. wartością per kolumna
+    if (
+        isinstance(mask, pd.Series) and pd.api.types.is_bool_dtype(mask.dtype)
+        and mask.index.equals(df.index)
+    ):
+        return mask
+
+    warnings.warn(
+        "row-wise predicates are deprecated; pass a function of the whole "
+        "DataFrame returning a boolean Series, or an expression string",
+        DeprecationWarning,
+        stacklevel=3
+    )
+    return df.apply(predicate, axis=1).astype(bool)
 
-def drop_rows_by_condition(df: pd.DataFrame, condition: Callable) -> pd.DataFrame:
-    """Drop rows that satisfy the given condition."""
-    mask = df.apply(condition, axis=1)
-    return df[~mask]
 
+def drop_rows_by_condition(df: pd.DataFrame, condition: Union[Callable, str]) -> pd.DataFrame:
+    """Drop rows that satisfy the given condition (see _row_mask)."""
+    return df[~_row_mask(df, condition)]
 
-def filter_rows(df: pd.DataFrame, condition: Callable) -> pd.DataFrame:
-    """Filter rows based on a condition function."""
-    mask = df.apply(condition, axis=1)
-    return df[mask]
+
+def filter_rows(df: pd.DataFrame, condition: Union[Callable, str]) -> pd.DataFrame:
+    """Keep rows that satisfy the given condition (see _row_mask)."""
+    return df[_row_mask(df, condition)]
 
 
 # --- Data cleaning -----------------------------------------------------------
 
 def drop_empty_columns(df: pd.DataFrame) -> pd.DataFrame:
     """Drop columns that contain only NaN values."""
-    return df.dropna(axis=1, how="all")
+    if df.empty:
+        return df.dropna(axis=1, how="all")
+    # a value in the first row already keeps the column; only the
+    # remaining columns need a full scan
+    keep = df.iloc[0].notna().to_numpy()
+    rest = np.flatnonzero(~keep)
+    if rest.size:
+        keep[rest] = df.iloc[:, rest].notna().to_numpy().any(axis=0)
+    return df.iloc[:, keep]
 
 
 # --- Math and aggregation ----------------------------------------------------
@@ -100,18 +339,18 @@ def math_operation(df: pd.DataFrame, col1: str, col2: str, op: str, new_name: st
     """
     if col1 not in df.columns or col2 not in df.columns:
         raise KeyError("One or both columns not found in DataFrame.")
-    
-    if op == "sum":
-        df[new_name] = df[col1] + df[col2]
-    elif op == "diff":
-        df[new_name] = df[col1] - df[col2]
-    elif op == "prod":
-        df[new_name] = df[col1] * df[col2]
-    elif op == "mean":
-        df[new_name] = (df[col1] + df[col2]) / 2
-    else:
+
+    if op not in _MATH_OPS:
         raise ValueError(f"Unsupported operation: {op}")
-    
+
+    a, b = _widen(df[col1]), _widen(df[col2])
+    if isinstance(a.dtype, np.dtype) and isinstance(b.dtype, np.dtype):
+        result = kernels.binary(op, a.to_numpy(), b.to_numpy())
+        if result is not None:
+            df[new_name] = result
+            return df
+
+    df[new_name] = _MATH_OPS[op](a, b)
     return df
 
 
@@ -120,35 +359,105 @@ def math_operation(df: pd.DataFrame, col1: str, col2: str, op: str, new_name: st
 def group_and_aggregate(
     df: pd.DataFrame,
     by: Union[str, List[str]],
-    agg_funcs: Dict[str, List[str]]
+    agg_funcs: Dict[str, List[str]],
+    grouped: Optional[DataFrameGroupBy] = None,
+    engine: Optional[str] = None,
+    engine_kwargs: Optional[Dict[str, bool]] = None,
+    named: bool = False
 ) -> pd.DataFrame:
-    """Group DataFrame by one or more columns and apply aggregation functions. """
-    return df.groupby(by).agg(agg_funcs).reset_index()
+    """Group DataFrame by one or more columns and apply aggregation functions.
+
+    `grouped` may be an existing `df.groupby(by)` object; it is reused
+    instead of grouping the frame again. With `engine` (e.g. "numba"),
+    built-in reductions on numeric columns run through that engine; any
+    other mapping falls back to the default path. `named=True` returns flat
+    "<column>_<func>" columns (named aggregation) instead of a MultiIndex.
+    """
+    if grouped is None:
+        grouped = df.groupby(by, observed=True)
+
+    pairs = [
+        (col, func)
+        for col, funcs in agg_funcs.items()
+        for func in ([funcs] if isinstance(funcs, str) else funcs)
+    ]
+
+    if engine is not None and _engine_aggregable(df, agg_funcs):
+        parts = [
+            getattr(grouped[col], func)(engine=engine, engine_kwargs=engine_kwargs)
+            for col, func in pairs
+        ]
+        if named:
+            columns = pd.Index([f"{col}_{func}" for col, func in pairs])
+        elif all(isinstance(f, str) for f in agg_funcs.values()):
+            columns = pd.Index([col for col, _ in pairs])
+        else:
+            # as in DataFrameGroupBy.agg: one list makes every column (col, func)
+            columns = pd.MultiIndex.from_tuples(pairs)
+        result = pd.concat(parts, axis=1)
+        result.columns = columns
+        return result.reset_index()
+
+    if named:
+        return grouped.agg(**{
+            f"{col}_{getattr(func, '__name__', func)}": pd.NamedAgg(col, func)
+            for col, func in pairs
+        }).reset_index()
+    return grouped.agg(agg_funcs).reset_index()
+
+
+def _engine_aggregable(df: pd.DataFrame, agg_funcs: Dict[str, Any]) -> bool:
+    """True if every aggregation is a built-in reduction on a numeric column."""
+    for col, funcs in agg_funcs.items():
+        funcs = [funcs] if isinstance(funcs, str) else funcs
+        dtype = df[col].dtype
+        if not (isinstance(dtype, np.dtype) and dtype.kind in "iuf"):
+            return False
+        if not all(isinstance(f, str) and f in _ENGINE_AGGS for f in funcs):
+            return False
+    return True
 
 
 # --- Text filtering ----------------------------------------------------------
 
-def filter_text(df: pd.DataFrame, column: str, mode: str, pattern: str) -> pd.DataFrame:
+def filter_text(
+    df: pd.DataFrame, column: str, mode: str, pattern: str, regex: bool = False
+) -> pd.DataFrame:
     """Filter rows based on text matching in a column.
 
     Modes:
-        - 'contains'
+        - 'contains' (plain substring unless regex=True)
         - 'startswith'
         - 'endswith'
     """
     if column not in df.columns:
         raise KeyError(f"Column '{column}' not found in DataFrame.")
-
-    if mode == "contains":
-        mask = df[column].astype(str).str.contains(pattern, na=False)
-    elif mode == "startswith":
-        mask = df[column].astype(str).str.startswith(pattern, na=False)
-    elif mode == "endswith":
-        mask = df[column].astype(str).str.endswith(pattern, na=False)
-    else:
+    op = _STR_OPS.get(mode)
+    if op is None:
         raise ValueError(f"Unsupported text filter mode: {mode}")
 
-    return df[mask]
+    if pc is not None and not regex:
+        return df[_arrow_text_mask(df[column], _ARROW_STR_OPS[mode], pattern)]
+    return df[op(df[column].astype(str).str, pattern, regex)]
+
+
+def _arrow_text_mask(series: pd.Series, kernel: str, pattern: str) -> np.ndarray:
+    """Boolean mask from a pyarrow.compute string kernel.
+
+    Arrow-backed string columns are scanned in place (missing values do not
+    match); anything else is converted with astype(str) first, as in the
+    pandas path.
+    """
+    dtype = series.dtype
+    if (isinstance(dtype, pd.StringDtype) and dtype.storage == "pyarrow") or (
+        isinstance(dtype, pd.ArrowDtype)
+        and (pa.types.is_string(dtype.pyarrow_dtype) or pa.types.is_large_string(dtype.pyarrow_dtype))
+    ):
+        values = pa.array(series)
+    else:
+        values = pa.array(series.astype(str), type=pa.string())
+    mask = getattr(pc, kernel)(values, pattern)
+    return pc.fill_null(mask, False).to_numpy(zero_copy_only=False)
 
 
 # --- Time-series operations ---------------------------------------------------
@@ -167,38 +476,39 @@ def resample_time_series(
     if datetime_col not in df.columns:
         raise KeyError(f"Datetime column '{datetime_col}' not found in DataFrame.")
 
-    df_copy = df.copy()
-    df_copy[datetime_col] = pd.to_datetime(df_copy[datetime_col])
-    df_copy = df_copy.set_index(datetime_col)
+    # copy only the aggregated columns and index them by time once;
+    # resample sorts an unsorted index itself
+    data = df[list(agg_funcs)]
+    data.index = pd.DatetimeIndex(pd.to_datetime(df[datetime_col]), name=datetime_col)
 
     # Force consistent weekly alignment to match tests
     if freq.upper() == "W":
-        res = df_copy.resample("W-SUN", label="left", closed="left").agg(agg_funcs)
+        res = data.resample("W-SUN", label="left", closed="left").agg(agg_funcs)
     else:
-        res = df_copy.resample(freq).agg(agg_funcs)
+        res = data.resample(freq).agg(agg_funcs)
 
     return res.reset_index()
 
 
-def rolling_stat(df: pd.DataFrame, column: str, window: int, func: str = "mean") -> pd.Series:
+def rolling_stat(
+    df: pd.DataFrame,
+    column: str,
+    window: int,
+    func: str = "mean",
+    engine: Optional[str] = None,
+    engine_kwargs: Optional[Dict[str, bool]] = None
+) -> pd.Series:
     """
     Compute rolling statistic over `window` rows for `column`.
-    func supports: mean, sum, min, max, std.
+    func supports: mean, sum, min, max, median, std, var.
+    `engine`/`engine_kwargs` are passed to pandas (e.g. engine="numba").
     """
     if column not in df.columns:
         raise KeyError(f"Column '{column}' not found in DataFrame.")
+    if func not in _ROLLING_FUNCS:
+        raise ValueError(f"Unsupported rolling function: {func}")
 
     ser = df[column].rolling(window=window)
-
-    if func == "mean":
-        return ser.mean()
-    elif func == "sum":
-        return ser.sum()
-    elif func == "min":
-        return ser.min()
-    elif func == "max":
-        return ser.max()
-    elif func == "std":
-        return ser.std()
-    else:
-        raise ValueError(f"Unsupported rolling function: {func}")
\ No newline at end of file
+    if engine is None:
+        return getattr(ser, func)()
+    return getattr(ser, func)(engine=engine, engine_kwargs=engine_kwargs)
\ No newline at end of file
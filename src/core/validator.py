@@ -1,7 +1,20 @@
+import numpy as np
 import pandas as pd
 from typing import Dict, List, Set, Any, Optional
 
 
+def _is_numeric(series: pd.Series) -> bool:
+    return isinstance(series.dtype, np.dtype) and series.dtype.kind in "biuf"
+
+
+def _reduce(series: pd.Series, ufunc: np.ufunc, method: str) -> Any:
+    """min/max of a column skipping NaN, without allocating a comparison mask."""
+    if _is_numeric(series) and len(series):
+        # fmin/fmax ignore NaN and skip the NaN masking of Series.min/max
+        return ufunc.reduce(series.to_numpy())
+    return getattr(series, method)()
+
+
 def check_missing_values(df: pd.DataFrame) -> Dict[str, int]:
     """Return a dictionary with counts of missing values per column."""
     return df.isna().sum().to_dict()
@@ -9,21 +22,25 @@ def check_missing_values(df: pd.DataFrame) -> Dict[str, int]:
 
 def validate_no_missing(df: pd.DataFrame, columns: Optional[List[str]] = None) -> bool:
     """Validate that specified columns contain no missing values."""
-    cols = columns or df.columns.tolist()
-    missing = df[cols].isna().sum()
-    if (missing > 0).any():
+    view = df[columns] if columns else df
+    nulls = view.isna()
+    if nulls.to_numpy().any():
+        # per-column counts only for the error message
+        missing = nulls.sum()
         raise ValueError(f"Missing values found in columns: {missing[missing > 0].to_dict()}")
     return True
 
 
 def validate_column_types(df: pd.DataFrame, expected_types: Dict[str, str]) -> bool:
     """Validate that columns have the expected pandas dtypes."""
+    dtypes = df.dtypes
     mismatches = {}
     for col, expected in expected_types.items():
-        if col not in df.columns:
+        if col not in dtypes.index:
             raise KeyError(f"Column '{col}' not found in DataFrame.")
-        if str(df[col].dtype) != expected:
-            mismatches[col] = str(df[col].dtype)
+        # dtype objects compare equal to their names and aliases ('i8', 'category')
+        if dtypes[col] != expected:
+            mismatches[col] = str(dtypes[col])
     if mismatches:
         raise TypeError(f"Column dtype mismatches: {mismatches}")
     return True
@@ -31,7 +48,13 @@ def validate_column_types(df: pd.DataFrame, expected_types: Dict[str, str]) -> b
 
 def validate_unique(df: pd.DataFrame, columns: List[str]) -> bool:
     """Validate that specified columns contain only unique values."""
-    if df.duplicated(subset=columns).any():
+    if len(columns) == 1 and _is_numeric(df[columns[0]]):
+        # sorting a numeric array beats hashing it on large columns
+        values = df[columns[0]].to_numpy()
+        duplicated = np.unique(values).size != values.size
+    else:
+        duplicated = df.duplicated(subset=columns).any()
+    if duplicated:
         raise ValueError(f"Duplicate values found in columns: {columns}")
     return True
 
@@ -45,18 +68,21 @@ def validate_value_ranges(
     """Validate that column values lie within a given range."""
     if column not in df.columns:
         raise KeyError(f"Column '{column}' not found in DataFrame.")
-    if min_value is not None and (df[column] < min_value).any():
+    values = df[column]
+    if min_value is not None and _reduce(values, np.fmin, "min") < min_value:
         raise ValueError(f"Values in column '{column}' are below {min_value}")
-    if max_value is not None and (df[column] > max_value).any():
+    if max_value is not None and _reduce(values, np.fmax, "max") > max_value:
         raise ValueError(f"Values in column '{column}' are above {max_value}")
     return True
 
 
 def validate_schema(df: pd.DataFrame, expected_columns: List[str]) -> bool:
     """Validate that DataFrame has exactly the expected columns (order ignored)."""
-    if set(df.columns) != set(expected_columns):
+    found, expected = set(df.columns), set(expected_columns)
+    if found != expected:
         raise ValueError(
-            f"Schema mismatch. Expected: {expected_columns}, Found: {list(df.columns)}"
+            f"Schema mismatch. Missing: {sorted(expected - found, key=str)}, "
+            f"Unexpected: {sorted(found - expected, key=str)}"
         )
     return True
 
@@ -64,8 +90,10 @@ def validate_allowed_values(df: pd.DataFrame, column: str, allowed: Set[Any]) ->
     """Validate that values in `column` are within allowed set."""
     if column not in df.columns:
         raise KeyError(f"Column '{column}' not found in DataFrame.")
-    unique_vals = set(df[column].dropna().unique())
-    bad = unique_vals - set(allowed)
+    # unique() first: allowed-value columns have few distinct values, so
+    # the set difference is tiny; NaN is dropped from the result instead
+    # of copying the column through dropna()
+    bad = {v for v in set(df[column].unique()).difference(allowed) if not pd.isna(v)}
     if bad:
         raise ValueError(f"Column '{column}' contains values outside allowed set: {sorted(bad)}")
     return True
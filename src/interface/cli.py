@@ -191,7 +191,7 @@ def drop_where_cmd(column: str, value: str):
         raise typer.Exit()
 
     try:
-        STATE["df"] = drop_rows_by_condition(df, lambda row: str(row[column]) == value)
+        STATE["df"] = drop_rows_by_condition(df, lambda df: df[column].astype(str) == value)
         print("[green]Rows dropped[/green]")
         _show_df(STATE["df"])
     except Exception as e:
@@ -337,8 +337,8 @@ def export_npy_cmd(out: str, overwrite: bool = False):
     if df is None:
         raise typer.Exit()
 
-    export_to_numpy(df, out, overwrite=overwrite)
-    print(f"[green]Saved NPY to[/green] {out}")
+    out = export_to_numpy(df, out, overwrite=overwrite)
+    print(f"[green]Saved NumPy to[/green] {out}")
 
 
 # -----------------------------------------------------------------------------
@@ -504,7 +504,7 @@ def menu_processing():
             elif sub == "3":
                 col = input("Column: ").strip()
                 val = input("Value to match: ").strip()
-                STATE["df"] = drop_rows_by_condition(STATE["df"], lambda row: str(row[col]) == val)
+                STATE["df"] = drop_rows_by_condition(STATE["df"], lambda df: df[col].astype(str) == val)
                 print("[green]Rows removed[/green]")
                 _show_df(STATE["df"])
 
@@ -624,8 +624,8 @@ def menu_export():
 
             elif sub == "2":
                 out = input("Output filename: ").strip()
-                export_to_numpy(STATE["df"], out)
-                print("[green]Saved NPY[/green]")
+                out = export_to_numpy(STATE["df"], out)
+                print(f"[green]Saved NumPy to[/green] {out}")
 
         except Exception as e:
             print(f"[red]Error:[/red] {e}")
@@ -1,71 +1,283 @@
+import os
+import warnings
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import numpy as np
 import pandas as pd
+from pandas.core.groupby import DataFrameGroupBy
 from typing import Optional, List, Dict, Any, Set
 
 from src.core.loader import (
     load_csv, 
     preview_dataframe, 
     get_dataframe_stat_summary, 
-    set_column_names
+    set_column_names,
+    optimize_dtypes
 )
 from src.core.exporter import export_to_csv, export_to_numpy
 from src.core.processor import (
     drop_columns, add_column, create_column_from_existing,
-    drop_rows_by_index, drop_rows_by_condition, drop_empty_columns,
-    math_operation, group_and_aggregate, filter_text, resample_time_series,
-    rolling_stat, filter_rows, add_column_from_expression
+    drop_rows_by_index, drop_empty_columns, math_operation,
+    group_and_aggregate, filter_text, resample_time_series, rolling_stat,
+    add_column_from_expression
 )
 from src.core.validator import (
     validate_schema, validate_no_missing, validate_value_ranges,
     validate_unique, validate_allowed_values, check_missing_values, data_quality_report
 )
 
+try:
+    import pyarrow  # noqa: F401 - wielowątkowy parser CSV dla pandas
+    CSV_ENGINE: Optional[str] = "pyarrow"
+except ImportError:
+    CSV_ENGINE = None
+
+# liczba wierszy próbki, z której ustalane są typy kolumn przy wczytywaniu
+SAMPLE_ROWS = 10_000
+
+# liczba wierszy zapisywanych naraz przy eksporcie CSV
+EXPORT_CHUNK_ROWS = 65536
+
 
 class DataController:
     def __init__(self):
         self.df: Optional[pd.DataFrame] = None
         self.path: Optional[str] = None
 
-        self._undo_stack: list[pd.DataFrame] = []
-        self._redo_stack: list[pd.DataFrame] = []
+        # wpisy historii:
+        #   ("frame", df)                 - pełna kopia ramki (albo sama ramka,
+        #                                   gdy operacja jej nie zmienia)
+        #   ("drop", [kolumny])           - cofnięcie dodania kolumn
+        #   ("insert", kolumny_df, pozycje) - cofnięcie usunięcia kolumn
+        self._undo_stack: list[tuple] = []
+        self._redo_stack: list[tuple] = []
+
+        # kolumny zakodowane jako kategorie (str) do szybkiego filtrowania
+        self._cat_cache: dict[str, pd.Categorical] = {}
+        # obiekty groupby, klucz: kolumny, wartość: (ramka, groupby); wpis
+        # jest ważny tylko dla tej samej ramki, więc przeżywa undo do niej
+        self._gb_cache: dict[tuple, tuple[pd.DataFrame, DataFrameGroupBy]] = {}
+
+        # pula wątków tworzona przy pierwszym submit()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    # -------------------------------------------------
+    # Background execution
+    # -------------------------------------------------
+    def submit(self, fn, *args, **kwargs) -> Future:
+        """Run `fn(*args, **kwargs)` on the controller's worker pool.
+
+        Intended for read-only work (validation, export) and IO that
+        releases the GIL; calls that replace self.df must not overlap.
+        """
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=os.cpu_count(), thread_name_prefix="controller"
+            )
+        return self._executor.submit(fn, *args, **kwargs)
+
+    def shutdown(self, wait: bool = True):
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
 
     # -------------------------------------------------
     # UNDO / REDO CORE
     # -------------------------------------------------
+    def _push_undo(self, entry: tuple):
+        self._undo_stack.append(entry)
+        self._redo_stack.clear()
+        self._cat_cache.clear()
+
     def _save_state(self):
+        # undo przywróci kopię, nie tę ramkę - jej obiekty groupby są zbędne
+        self._gb_cache.clear()
         if self.df is not None:
-            self._undo_stack.append(self.df.copy(deep=True))
-            self._redo_stack.clear()
+            self._push_undo(("frame", self.df.copy(deep=True)))
+        else:
+            self._clear_caches()
+
+    def _addonly_entry(self, name: str) -> Optional[tuple]:
+        # operacja tylko dopisuje kolumnę - wystarczy zapamiętać jej nazwę;
+        # nadpisanie istniejącej kolumny wymaga kopii sprzed zmiany
+        if self.df is None:
+            return None
+        if name not in self.df.columns:
+            return ("drop", [name])
+        return ("frame", self.df.copy(deep=True))
+
+    def _save_addonly(self, entry: Optional[tuple]):
+        # wywoływane dopiero po udanej operacji - błąd nie zostawia wpisu
+        # i nie czyści redo; ramka zmieniła się w miejscu, więc jej
+        # obiekty groupby są nieaktualne
+        self._gb_cache.clear()
+        if entry is not None:
+            self._push_undo(entry)
+
+    def _save_dropped(self, cols: List[str]):
+        # zapamiętujemy tylko usuwane kolumny i ich pozycje
+        cols = [c for c in dict.fromkeys(cols) if c in self.df.columns]
+        positions = [self.df.columns.get_loc(c) for c in cols]
+        # undo wstawi kolumny do nowej ramki - groupby starej są zbędne
+        self._gb_cache.clear()
+        self._push_undo(("insert", self.df[cols], positions))
+
+    def _restore(self, entry: tuple) -> tuple:
+        """Apply a history entry to self.df and return its inverse."""
+        kind = entry[0]
+        if kind == "drop":
+            cols = [c for c in entry[1] if c in self.df.columns]
+            positions = [self.df.columns.get_loc(c) for c in cols]
+            inverse = ("insert", self.df[cols], positions)
+            self.df = self.df.drop(columns=cols)
+        elif kind == "insert":
+            _, data, positions = entry
+            df = self.df.copy(deep=False)
+            for pos, col in sorted(zip(positions, data.columns)):
+                df.insert(pos, col, data[col])
+            inverse = ("drop", list(data.columns))
+            self.df = df
+        else:
+            inverse = ("frame", self.df.copy(deep=True))
+            self.df = entry[1]
+        self._cat_cache.clear()
+        self._prune_gb_cache()
+        return inverse
 
     def undo(self):
         if not self._undo_stack:
             return self.df
 
-        self._redo_stack.append(self.df.copy(deep=True))
-        self.df = self._undo_stack.pop()
+        self._redo_stack.append(self._restore(self._undo_stack.pop()))
         return self.df
 
     def redo(self):
         if not self._redo_stack:
             return self.df
 
-        self._undo_stack.append(self.df.copy(deep=True))
-        self.df = self._redo_stack.pop()
+        self._undo_stack.append(self._restore(self._redo_stack.pop()))
+        return self.df
+
+    # -------------------------------------------------
+    # Caches
+    # -------------------------------------------------
+    def _clear_caches(self):
+        self._cat_cache.clear()
+        self._gb_cache.clear()
+
+    def _prune_gb_cache(self):
+        # zostają tylko obiekty groupby ramek, które można jeszcze pokazać:
+        # bieżącej i zapisanych w historii bez kopii
+        alive = {id(self.df)} | {
+            id(entry[1]) for entry in self._undo_stack + self._redo_stack
+            if entry[0] == "frame"
+        }
+        self._gb_cache = {
+            key: cached for key, cached in self._gb_cache.items()
+            if id(cached[0]) in alive
+        }
+
+    def _grouped(self, by: List[str]) -> DataFrameGroupBy:
+        key = tuple(by)
+        cached = self._gb_cache.get(key)
+        if cached is not None and cached[0] is self.df:
+            return cached[1]
+        grouped = self.df.groupby(by, observed=True)
+        self._gb_cache[key] = (self.df, grouped)
+        return grouped
+
+    def _categorical(self, column: str) -> pd.Categorical:
+        cat = self._cat_cache.get(column)
+        if cat is None:
+            if column not in self.df.columns:
+                raise KeyError(f"Column '{column}' not found in DataFrame.")
+            series = self.df[column]
+            if (
+                pd.api.types.is_datetime64_any_dtype(series)
+                or pd.api.types.is_timedelta64_dtype(series)
+            ):
+                # str() jak w tabeli ("2024-01-01 00:00:00"), astype(str)
+                # skraca północ do "2024-01-01"; NaT zostaje wartością "NaT"
+                codes, uniques = pd.factorize(series, use_na_sentinel=False)
+                cat = pd.Categorical.from_codes(codes, uniques.map(str))
+            else:
+                cat = pd.Categorical(series.astype(str))
+            self._cat_cache[column] = cat
+        return cat
+
+    def _filter_by_value(self, column: str, value: str, keep: bool):
+        cat = self._categorical(column)
+        if value in cat.categories:
+            mask = cat.codes == cat.categories.get_loc(value)
+        else:
+            mask = np.zeros(len(cat), dtype=bool)
+        if not keep:
+            mask = ~mask
+
+        # filtrowanie usuwa tylko wiersze, więc zakodowane kolumny
+        # pozostają ważne po nałożeniu tej samej maski
+        cached = {c: cached_cat[mask] for c, cached_cat in self._cat_cache.items()}
+
+        self._save_state()
+        self.df = self.df[mask]
+        self._cat_cache = cached
         return self.df
 
     # -------------------------------------------------
     # Loading / Preview
     # -------------------------------------------------
-    def load(self, filepath: str, sep: str = ",") -> pd.DataFrame:
-        df = load_csv(filepath, sep=sep)
+    @staticmethod
+    def _sample_dtypes(sample: pd.DataFrame) -> Dict[str, str]:
+        # z próbki bierzemy tylko kategorie - są bezstratne dla każdej
+        # wartości; zawężenie int/float z próbki mogłoby przepełnić się
+        # na dalszych wierszach, więc robi je optimize_dtypes po odczycie
+        optimize_dtypes(sample, min_rows=0)
+        return {
+            col: "category" for col, dtype in sample.dtypes.items()
+            if isinstance(dtype, pd.CategoricalDtype)
+        }
+
+    def _read(self, filepath: str, sep: str) -> pd.DataFrame:
+        if filepath.lower().endswith((".npy", ".npz")):
+            return load_csv(filepath, sep=sep)
+
+        # pierwszy przebieg: próbka do ustalenia typów kolumn
+        sample = load_csv(filepath, sep=sep, nrows=SAMPLE_ROWS)
+        if len(sample) < SAMPLE_ROWS:
+            # cały plik zmieścił się w próbce
+            return sample
+        dtype = self._sample_dtypes(sample)
+
+        if CSV_ENGINE is None:
+            warnings.warn(
+                "pyarrow is not installed, using the default CSV parser",
+                RuntimeWarning
+            )
+        # "auto": pyarrow, a gdy nie poradzi sobie z plikiem (np. nieregularne
+        # wiersze) - zwykły parser pandas
+        return load_csv(filepath, sep=sep, engine="auto", dtype=dtype)
+
+    def read(self, filepath: str, sep: str = ",") -> pd.DataFrame:
+        """Parse a file without touching the controller state.
+
+        Safe to call from a worker thread; pass the result to attach().
+        """
+        return optimize_dtypes(self._read(filepath, sep))
+
+    def attach(self, df: pd.DataFrame, filepath: str) -> pd.DataFrame:
         self.df = df
         self.path = filepath
 
         # reset historii przy nowym pliku
         self._undo_stack.clear()
         self._redo_stack.clear()
+        self._clear_caches()
 
         return df
 
+    def load(self, filepath: str, sep: str = ",") -> pd.DataFrame:
+        return self.attach(self.read(filepath, sep), filepath)
+
     def preview_rows(self, rows: int, tail: bool = False) -> pd.DataFrame:
         if tail:
             return self.df.tail(rows)
@@ -79,28 +291,33 @@ class DataController:
     # Processing 
     # -------------------------------------------------
     def drop_columns(self, cols: List[str]) -> pd.DataFrame:
-        self._save_state()
-        self.df = drop_columns(self.df, cols)
+        df = drop_columns(self.df, cols)
+        self._save_dropped(cols)
+        self.df = df
         return self.df
 
     def add_column(self, name: str, values: List[Any]) -> pd.DataFrame:
-        self._save_state()
+        entry = self._addonly_entry(name)
         self.df = add_column(self.df, name, values)
+        self._save_addonly(entry)
         return self.df
 
     def add_derived_column(self, col1: str, col2: str, op: str, new_name: str):
-        self._save_state()
+        entry = self._addonly_entry(new_name)
         self.df = math_operation(self.df, col1, col2, op, new_name)
+        self._save_addonly(entry)
         return self.df
 
     def add_column_expression(self, name: str, expr: str):
-        self._save_state()
+        entry = self._addonly_entry(name)
         self.df = add_column_from_expression(self.df, name, expr)
+        self._save_addonly(entry)
         return self.df
 
     def create_column_from_existing(self, new_name: str, base: str, func):
-        self._save_state()
+        entry = self._addonly_entry(new_name)
         self.df = create_column_from_existing(self.df, new_name, func)
+        self._save_addonly(entry)
         return self.df
 
     def drop_rows_by_index(self, indexes: List[int]):
@@ -109,22 +326,24 @@ class DataController:
         return self.df
 
     def drop_rows_by_condition(self, column: str, value: str):
-        self._save_state()
-        self.df = drop_rows_by_condition(
-            self.df, lambda row: str(row[column]) == value
-        )
-        return self.df
+        return self._filter_by_value(column, value, keep=False)
 
     def filter_where(self, column: str, value: str):
-        self._save_state()
-        self.df = filter_rows(
-            self.df, lambda row: str(row[column]) == value
-        )
-        return self.df
+        return self._filter_by_value(column, value, keep=True)
 
-    def group_and_aggregate(self, by: List[str], agg: Dict[str, List[str]]):
-        self._save_state()
-        self.df = group_and_aggregate(self.df, by, agg)
+    def group_and_aggregate(
+        self, by: List[str], agg: Dict[str, List[str]],
+        engine: Optional[str] = None
+    ):
+        # grupowanie wykonujemy przed zapisem stanu, żeby nieudana agregacja
+        # nie zostawiała wpisu w historii i mogła ponownie użyć groupby
+        result = group_and_aggregate(
+            self.df, by, agg, grouped=self._grouped(by), engine=engine
+        )
+        # agregacja nie zmienia ramki - historia trzyma ten sam obiekt zamiast
+        # kopii, więc po undo groupby z cache nadal do niej pasuje
+        self._push_undo(("frame", self.df))
+        self.df = result
         return self.df
 
     def text_filter(self, column: str, mode: str, pattern: str):
@@ -132,11 +351,17 @@ class DataController:
         self.df = filter_text(self.df, column, mode, pattern)
         return self.df
 
-    def rolling(self, column: str, window: int, func: str = "mean"):
-        self._save_state()
-        series = rolling_stat(self.df, column, window, func)
+    def rolling(
+        self, column: str, window: int, func: str = "mean",
+        engine: Optional[str] = None
+    ):
+        # domyślnie silnik cython pandas - dla pojedynczej kolumny numba
+        # nie jest szybsza, a pierwsza kompilacja trwa kilka sekund
+        series = rolling_stat(self.df, column, window, func, engine=engine)
         name = f"rolling_{func}_{column}_{window}"
+        entry = self._addonly_entry(name)
         self.df[name] = series
+        self._save_addonly(entry)
         return self.df
 
     def resample(self, datetime_col: str, freq: str, agg_funcs: Dict[str, str]):
@@ -176,10 +401,13 @@ class DataController:
     # Export
     # -------------------------------------------------
     def export_csv(self, path: str, overwrite: bool = True):
-        export_to_csv(self.df, path, overwrite=overwrite)
+        export_to_csv(
+            self.df, path, overwrite=overwrite, chunksize=EXPORT_CHUNK_ROWS
+        )
 
-    def export_numpy(self, path: str, overwrite: bool = True):
-        export_to_numpy(self.df, path, overwrite=overwrite)
+    def export_numpy(self, path: str, overwrite: bool = True) -> str:
+        # ramki mieszane trafiają do archiwum .npz - zwracamy faktyczną ścieżkę
+        return export_to_numpy(self.df, path, overwrite=overwrite)
 
     # -------------------------------------------------
     # Helpers 
@@ -187,12 +415,20 @@ class DataController:
     def ensure_id(
         self, id_col: str = "id", start: int = 1, set_as_index: bool = True
     ):
-        self._save_state()
-
-        if id_col not in self.df.columns:
-            self.df[id_col] = range(start, start + len(self.df))
+        if id_col in self.df.columns:
+            self._save_state()
+            if set_as_index:
+                self.df = self.df.set_index(id_col)
+            return self.df
 
+        stop = start + len(self.df)
         if set_as_index:
-            self.df = self.df.set_index(id_col)
+            # RangeIndex nie materializuje wartości - O(1) pamięci
+            self._save_state()
+            self.df.index = pd.RangeIndex(start, stop, name=id_col)
+        else:
+            entry = self._addonly_entry(id_col)
+            self.df[id_col] = np.arange(start, stop, dtype=np.int64)
+            self._save_addonly(entry)
 
         return self.df
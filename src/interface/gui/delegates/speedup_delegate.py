@@ -0,0 +1,34 @@
+from PySide6.QtWidgets import QStyledItemDelegate, QStyleOptionViewItem
+from PySide6.QtCore import Qt
+
+from src.interface.gui.models.pandas_model import MultipleRoles
+
+
+class SpeedUpDelegate(QStyledItemDelegate):
+    """Item delegate that asks the model for all roles of a cell at once.
+
+    The default initStyleOption calls data() separately for font,
+    alignment, colours, check state, decoration and text - one Python call
+    each per painted cell. Models answering MultipleRoles return a dict
+    {role: value} instead, so painting costs a single call per cell.
+    """
+
+    def initStyleOption(self, option, index):
+        roles = index.data(MultipleRoles)
+        if not isinstance(roles, dict):
+            super().initStyleOption(option, index)
+            return
+
+        option.index = index
+
+        alignment = roles.get(Qt.TextAlignmentRole)
+        if alignment is not None:
+            option.displayAlignment = alignment
+
+        text = roles.get(Qt.DisplayRole)
+        if text is not None:
+            option.features |= QStyleOptionViewItem.HasDisplay
+            option.text = text
+
+        # same as QStyledItemDelegate: no style animations inside item views
+        option.styleObject = None
@@ -0,0 +1,22 @@
+import re
+from typing import Dict, List
+
+
+_RE = re.compile(r"\s*,\s*")
+
+
+def csv_list(text: str) -> List[str]:
+    """Split comma-separated input into stripped items ('' -> [])."""
+    text = text.strip()
+    if not text:
+        return []
+    return _RE.split(text)
+
+
+def kv_dict(text: str) -> Dict[str, str]:
+    """Parse 'col:sum,col2:mean' input into {'col': 'sum', 'col2': 'mean'}."""
+    result = {}
+    for pair in csv_list(text):
+        key, value = pair.split(":")
+        result[key.strip()] = value.strip()
+    return result
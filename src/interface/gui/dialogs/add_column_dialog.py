@@ -1,4 +1,5 @@
 from PySide6.QtWidgets import QDialog, QVBoxLayout, QLabel, QLineEdit, QPushButton
+from src.interface.gui.dialogs._parse import csv_list
 
 class AddColumnDialog(QDialog):
     def __init__(self, parent=None, df=None):
@@ -25,5 +26,4 @@ class AddColumnDialog(QDialog):
 
     def get_data(self):
         nm = self.name.text().strip()
-        vals = [v.strip() for v in self.values.text().split(",")] if self.values.text().strip() else []
-        return nm, vals
\ No newline at end of file
+        return nm, csv_list(self.values.text())
\ No newline at end of file
@@ -1,4 +1,5 @@
 from PySide6.QtWidgets import QDialog, QVBoxLayout, QLabel, QLineEdit, QPushButton
+from src.interface.gui.dialogs._parse import csv_list
 
 
 class DropColumnsDialog(QDialog):
@@ -20,7 +21,4 @@ class DropColumnsDialog(QDialog):
 
 
     def get_columns(self):
-        text = self.input.text().strip()
-        if not text:
-            return []
-        return [c.strip() for c in text.split(",")]
\ No newline at end of file
+        return csv_list(self.input.text())
\ No newline at end of file
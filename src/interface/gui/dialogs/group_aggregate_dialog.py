@@ -1,6 +1,7 @@
 from PySide6.QtWidgets import (
 QDialog, QVBoxLayout, QLabel, QLineEdit, QPushButton
 )
+from src.interface.gui.dialogs._parse import csv_list, kv_dict
 
 
 class GroupAggregateDialog(QDialog):
@@ -27,7 +28,4 @@ class GroupAggregateDialog(QDialog):
 
 
     def get_params(self):
-        by = [c.strip() for c in self.group.text().split(",")] if self.group.text().strip() else []
-        raw = [p.strip() for p in self.agg.text().split(",")] if self.agg.text().strip() else []
-        agg = {k: v for k, v in (pair.split(":") for pair in raw)} if raw else {}
-        return by, agg
\ No newline at end of file
+        return csv_list(self.group.text()), kv_dict(self.agg.text())
\ No newline at end of file
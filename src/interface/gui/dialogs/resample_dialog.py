@@ -1,6 +1,7 @@
 from PySide6.QtWidgets import (
 QDialog, QVBoxLayout, QLabel, QLineEdit, QPushButton
 )
+from src.interface.gui.dialogs._parse import kv_dict
 
 
 class ResampleDialog(QDialog):
@@ -32,6 +33,4 @@ class ResampleDialog(QDialog):
 
 
     def get_params(self):
-        agg_raw = [p.strip() for p in self.agg.text().split(",")] if self.agg.text().strip() else []
-        agg = {k: v for k, v in (pair.split(":") for pair in agg_raw)} if agg_raw else {}
-        return self.dtcol.text().strip(), self.freq.text().strip(), agg
\ No newline at end of file
+        return self.dtcol.text().strip(), self.freq.text().strip(), kv_dict(self.agg.text())
\ No newline at end of file
@@ -1,11 +1,69 @@
+from collections import OrderedDict
+
 from PySide6.QtCore import QAbstractTableModel, Qt
+import numpy as np
 import pandas as pd
 
 
+# rows decoded to display strings at once, and how many such blocks to keep
+BLOCK_ROWS = 64
+MAX_BLOCKS = 256
+
+
+# every cell has the same flags, so they are computed once
+CELL_FLAGS = Qt.ItemIsSelectable | Qt.ItemIsEnabled
+
+# custom role returning every painting role of a cell in one data() call,
+# see delegates/speedup_delegate.py
+MultipleRoles = Qt.UserRole + 1000
+
+
 class PandasModel(QAbstractTableModel):
-    def __init__(self, df=pd.DataFrame()):
+    def __init__(self, df=None):
         super().__init__()
-        self.df = df.reset_index() if not df.index.name is None else df.copy()
+        self._blocks = OrderedDict()
+        self._take(self._prepare(df))
+
+
+    def _take(self, new):
+        self.df = new
+        # layout the views were told about (rows, columns, header); a copy
+        # of the columns, since the controller's frame may change in place
+        self._shown_layout = (new.shape, new.columns.copy())
+
+
+    @staticmethod
+    def _prepare(df):
+        if df is None:
+            return pd.DataFrame()
+        # no copy: the model only reads the frame it is given
+        return df.reset_index() if not df.index.name is None else df
+
+
+    def set_dataframe(self, df):
+        """Show another DataFrame in the same model (views keep the model).
+
+        A frame with the same shape and columns (e.g. after undo of a value
+        change) only refreshes the cells, keeping scroll position and
+        selection; anything else resets the model.
+        """
+        new = self._prepare(df)
+        # self.df may be the same frame changed in place, so compare with the
+        # recorded layout rather than with self.df
+        shape, columns = self._shown_layout
+        if new.shape != shape or not new.columns.equals(columns):
+            self.beginResetModel()
+            self._take(new)
+            self._blocks.clear()
+            self.endResetModel()
+            return
+
+        self._take(new)
+        self._blocks.clear()
+        rows, cols = new.shape
+        if rows and cols:
+            self.dataChanged.emit(self.index(0, 0), self.index(rows - 1, cols - 1))
+            self.headerDataChanged.emit(Qt.Vertical, 0, rows - 1)
 
 
     def rowCount(self, parent=None):
@@ -16,9 +74,40 @@ class PandasModel(QAbstractTableModel):
         return len(self.df.columns)
 
 
+    def _block(self, col, block):
+        key = (col, block)
+        values = self._blocks.get(key)
+        if values is None:
+            start = block * BLOCK_ROWS
+            chunk = self.df.iloc[start:start + BLOCK_ROWS, col]
+            # numpy scalars keep the same str() as iat (e.g. float32)
+            if isinstance(chunk.dtype, np.dtype) and chunk.dtype.kind in "biufc":
+                chunk = chunk.to_numpy()
+            else:
+                chunk = chunk.tolist()
+            values = [str(v) for v in chunk]
+            self._blocks[key] = values
+            if len(self._blocks) > MAX_BLOCKS:
+                self._blocks.popitem(last=False)
+        else:
+            self._blocks.move_to_end(key)
+        return values
+
+
+    def flags(self, index):
+        return CELL_FLAGS if index.isValid() else Qt.NoItemFlags
+
+
+    def _text(self, index):
+        row = index.row()
+        return self._block(index.column(), row // BLOCK_ROWS)[row % BLOCK_ROWS]
+
+
     def data(self, index, role=Qt.DisplayRole):
+        if role == MultipleRoles:
+            return {Qt.DisplayRole: self._text(index)}
         if role == Qt.DisplayRole:
-            return str(self.df.iat[index.row(), index.column()])
+            return self._text(index)
         return None
 
 
@@ -27,4 +116,4 @@ class PandasModel(QAbstractTableModel):
             if orientation == Qt.Horizontal:
                 return str(self.df.columns[section])
             else:
-                return str(self.df.index[section])
\ No newline at end of file
+                return str(self.df.index[section])
@@ -1,13 +1,13 @@
-from PySide6.QtWidgets import (
-    QMainWindow, QPushButton, QTableView, QFileDialog, QMessageBox, QToolBar
-)
+from PySide6.QtWidgets import QMainWindow, QFileDialog, QMessageBox, QToolBar
 from PySide6.QtGui import QAction
-from PySide6.QtUiTools import QUiLoader
-from PySide6.QtCore import QFile
+from PySide6.QtCore import QTimer, QObject, QRunnable, QThreadPool, Signal
 from PySide6.QtWidgets import QMenu
 
+from src.core import kernels
 from src.interface.gui.controllers.data_controller import DataController
 from src.interface.gui.models.pandas_model import PandasModel
+from src.interface.gui.delegates.speedup_delegate import SpeedUpDelegate
+from src.interface.gui.windows.ui_main import Ui_MainWindow
 
 # dialogs
 from src.interface.gui.dialogs.drop_columns_dialog import DropColumnsDialog
@@ -21,26 +21,77 @@ from src.interface.gui.dialogs.preview_dialog import PreviewDialog
 from src.interface.gui.dialogs.separator_dialog import SeparatorDialog
 
 
-class MainWindow(QMainWindow):
-    def __init__(self, ui_path):
+# toolbar layout: (text, shortcut, slot name or submenu entries), None = separator
+_ACTIONS = [
+    ("Undo", "Ctrl+Z", "undo_action"),
+    ("Redo", "Ctrl+Y", "redo_action"),
+    None,
+    ("Drop columns", None, "show_drop_columns"),
+    ("Add column", None, [
+        ("From values", None, "show_add_column"),
+        ("From expression", None, "show_add_column_expression"),
+        ("From math (A + B)", None, "show_add_column_math"),
+    ]),
+    ("Group & aggregate", None, "show_group_aggregate"),
+    ("Rolling", None, "show_rolling"),
+    ("Resample", None, "show_resample"),
+]
+
+
+class _LoadSignals(QObject):
+    finished = Signal(object)
+    error = Signal(str)
+
+
+class _LoadTask(QRunnable):
+    """Parse a data file on a pool thread and report back through signals."""
+
+    def __init__(self, controller, path, sep):
         super().__init__()
+        self.signals = _LoadSignals()
+        self.controller = controller
+        self.path = path
+        self.sep = sep
 
-        loader = QUiLoader()
-        file = QFile(ui_path)
-        file.open(QFile.ReadOnly)
-        ui = loader.load(file)
-        file.close()
+    def run(self):
+        try:
+            df = self.controller.read(self.path, sep=self.sep)
+        except Exception as e:
+            self.signals.error.emit(str(e))
+        else:
+            self.signals.finished.emit(df)
+
+
+class MainWindow(QMainWindow):
+    def __init__(self):
+        super().__init__()
 
-        self.setCentralWidget(ui)
+        # generated from ui/main_window.ui, regenerate with:
+        #   pyside6-uic src/interface/ui/main_window.ui -o src/interface/gui/windows/ui_main.py
+        self.ui = Ui_MainWindow()
+        self.ui.setupUi(self)
         self.controller = DataController()
 
         # UI widgets
-        self.btnLoad = ui.findChild(QPushButton, "btnLoad")
-        self.btnPreviewHead = ui.findChild(QPushButton, "btnPreviewHead")
-        self.btnValidate = ui.findChild(QPushButton, "btnValidate")
-        self.btnExportCSV = ui.findChild(QPushButton, "btnExportCSV")
-        self.btnExportNumPy = ui.findChild(QPushButton, "btnExportNumPy")
-        self.tableView = ui.findChild(QTableView, "tableView")
+        self.btnLoad = self.ui.btnLoad
+        self.btnPreviewHead = self.ui.btnPreviewHead
+        self.btnValidate = self.ui.btnValidate
+        self.btnExportCSV = self.ui.btnExportCSV
+        self.btnExportNumPy = self.ui.btnExportNumPy
+        self.tableView = self.ui.tableView
+
+        # one model for the whole session; handlers only swap its DataFrame.
+        # Previews get their own model so the full one keeps its cached cells
+        self.model = PandasModel(None)
+        self._preview_model = PandasModel(None)
+        self.tableView.setModel(self.model)
+        self.tableView.setItemDelegate(SpeedUpDelegate(self.tableView))
+        # handlers only schedule a refresh; chained edits share one rebuild
+        self._pending_refresh = False
+        # file currently being read in the background
+        self._load_task = None
+        # created on first use and shared by load/export
+        self._file_dialog = None
 
         # Connect buttons
         self.btnLoad.clicked.connect(self.load_csv)
@@ -55,139 +106,178 @@ class MainWindow(QMainWindow):
 
         self.add_processing_actions()
 
+        # compile the numba kernels in the background instead of on the
+        # first derived column (no-op without numba)
+        kernels.launch_threads()
+        self.controller.submit(kernels.warmup)
+
     # -----------------------------------------------------
     # Toolbar Actions
     # -----------------------------------------------------
     def add_processing_actions(self):
-        act_undo = QAction("Undo", self)
-        act_undo.setShortcut("Ctrl+Z")
-        act_undo.triggered.connect(self.undo_action)
-        self.toolbar.addAction(act_undo)
-
-        act_redo = QAction("Redo", self)
-        act_redo.setShortcut("Ctrl+Y")
-        act_redo.triggered.connect(self.redo_action)
-        self.toolbar.addAction(act_redo)
-
-        self.toolbar.addSeparator()
-        act_drop = QAction("Drop columns", self)
-        act_drop.triggered.connect(self.show_drop_columns)
-        self.toolbar.addAction(act_drop)
-
-        act_add_col = QAction("Add column", self)
-        self.toolbar.addAction(act_add_col)
-
-        add_menu = QMenu(self)
-
-        act_add_values = QAction("From values", self)
-        act_add_values.triggered.connect(self.show_add_column)
-
-        act_add_expr = QAction("From expression", self)
-        act_add_expr.triggered.connect(self.show_add_column_expression)
-
-        act_add_math = QAction("From math (A + B)", self)
-        act_add_math.triggered.connect(self.show_add_column_math)
-
-        add_menu.addAction(act_add_values)
-        add_menu.addAction(act_add_expr)
-        add_menu.addAction(act_add_math)
-
-        act_add_col.setMenu(add_menu)
-
-        act_group = QAction("Group & aggregate", self)
-        act_group.triggered.connect(self.show_group_aggregate)
-        self.toolbar.addAction(act_group)
-
-        act_roll = QAction("Rolling", self)
-        act_roll.triggered.connect(self.show_rolling)
-        self.toolbar.addAction(act_roll)
+        self._add_actions(self.toolbar, _ACTIONS)
+
+    def _add_actions(self, target, entries):
+        for entry in entries:
+            if entry is None:
+                target.addSeparator()
+                continue
+
+            text, shortcut, slot = entry
+            action = QAction(text, self)
+            if shortcut:
+                action.setShortcut(shortcut)
+            if isinstance(slot, list):
+                menu = QMenu(self)
+                self._add_actions(menu, slot)
+                action.setMenu(menu)
+            else:
+                action.triggered.connect(getattr(self, slot))
+            target.addAction(action)
 
-        act_resample = QAction("Resample", self)
-        act_resample.triggered.connect(self.show_resample)
-        self.toolbar.addAction(act_resample)
+    # -----------------------------------------------------
+    # View refresh
+    # -----------------------------------------------------
+    def _schedule_refresh(self):
+        """Show the controller's frame once control returns to the event loop."""
+        if not self._pending_refresh:
+            self._pending_refresh = True
+            QTimer.singleShot(0, self._do_refresh)
+
+    def _do_refresh(self):
+        self._pending_refresh = False
+        df = self.controller.df
+        if df is None:
+            return
+        # the frame may be the same object changed in place (new values or
+        # columns), so always hand it over; an unchanged layout only
+        # refreshes the cells
+        self.model.set_dataframe(df)
+        self._show_model(self.model)
+
+    def _show_model(self, model):
+        if self.tableView.model() is model:
+            return
+        selection = self.tableView.selectionModel()
+        self.tableView.setModel(model)
+        # setModel creates a new selection model and leaves the old one alive
+        selection.deleteLater()
+
+    def _ask_path(self, caption, name_filter, save=False):
+        """Ask for a file with the shared dialog; returns "" when cancelled."""
+        dlg = self._file_dialog
+        if dlg is None:
+            dlg = self._file_dialog = QFileDialog(self)
+        dlg.setWindowTitle(caption)
+        dlg.setNameFilter(name_filter)
+        if save:
+            dlg.setAcceptMode(QFileDialog.AcceptSave)
+            dlg.setFileMode(QFileDialog.AnyFile)
+        else:
+            dlg.setAcceptMode(QFileDialog.AcceptOpen)
+            dlg.setFileMode(QFileDialog.ExistingFile)
+        dlg.selectFile("")
+
+        if not dlg.exec():
+            return ""
+        return dlg.selectedFiles()[0]
 
     # -----------------------------------------------------
     # GUI Actions
     # -----------------------------------------------------
     def undo_action(self):
-        df = self.controller.undo()
-        if df is not None:
-            self.tableView.setModel(PandasModel(df))
+        self.controller.undo()
+        self._schedule_refresh()
 
 
     def redo_action(self):
-        df = self.controller.redo()
-        if df is not None:
-            self.tableView.setModel(PandasModel(df))
+        self.controller.redo()
+        self._schedule_refresh()
 
 
     def load_csv(self):
-        path, _ = QFileDialog.getOpenFileName(
-            self,
+        path = self._ask_path(
             "Select data file",
-            "",
-            "Data files (*.csv *.npy);;CSV (*.csv);;NumPy (*.npy)"
+            "Data files (*.csv *.npy *.npz);;CSV (*.csv);;NumPy (*.npy *.npz)"
         )
 
         if not path:
             return
 
-        try:
-            # --- CSV -----------------------------------------------------------
-            if path.lower().endswith(".csv"):
-                dlg = SeparatorDialog(self)
-                if not dlg.exec():
-                    return
+        # --- CSV -----------------------------------------------------------
+        if path.lower().endswith(".csv"):
+            dlg = SeparatorDialog(self)
+            if not dlg.exec():
+                return
+            sep = dlg.get_separator()
 
-                sep = dlg.get_separator()
-                df = self.controller.load(path, sep=sep)
+        # --- NPY -----------------------------------------------------------
+        elif path.lower().endswith((".npy", ".npz")):
+            sep = ","
 
-            # --- NPY -----------------------------------------------------------
-            elif path.lower().endswith(".npy"):
-                df = self.controller.load(path)
+        else:
+            QMessageBox.warning(
+                self,
+                "Unsupported file",
+                "Only .csv, .npy and .npz files are supported"
+            )
+            return
 
-            else:
-                QMessageBox.warning(
-                    self,
-                    "Unsupported file",
-                    "Only .csv and .npy files are supported"
-                )
-                return
+        task = _LoadTask(self.controller, path, sep)
+        task.signals.finished.connect(self._on_loaded)
+        task.signals.error.connect(self._on_load_error)
+        # keeps the signals object alive until the result is delivered
+        self._load_task = task
+        self._set_busy(True)
+        QThreadPool.globalInstance().start(task)
 
-            self.tableView.setModel(PandasModel(df))
 
-        except Exception as e:
-            QMessageBox.critical(self, "Error", str(e))
+    def _on_loaded(self, df):
+        path, self._load_task = self._load_task.path, None
+        self._set_busy(False)
+        self.controller.attach(df, path)
+        self._schedule_refresh()
+
+
+    def _on_load_error(self, message):
+        self._load_task = None
+        self._set_busy(False)
+        QMessageBox.critical(self, "Error", message)
+
+
+    def _set_busy(self, busy):
+        for widget in (
+            self.btnLoad, self.btnPreviewHead, self.btnValidate,
+            self.btnExportCSV, self.btnExportNumPy, self.toolbar
+        ):
+            widget.setEnabled(not busy)
 
 
 
     # --- VALIDATION ---
     def show_validation_dialog(self):
-        if self.controller.df is None:
+        df = self.controller.df
+        if df is None:
             QMessageBox.warning(self, "No data", "Load CSV first")
             return
 
         report = self.controller.quality_report()
 
-        lines = []
-        lines.append(f"Rows: {report['rows']}")
-        lines.append(f"Columns: {report['columns']}")
-        lines.append("")
-        lines.append("Missing values:")
-
-        for col, count in report["missing"].items():
-            pct = report["missing_pct"][col]
-            if count > 0:
-                lines.append(f"  {col}: {count} ({pct}%)")
-
-        lines.append("")
-        lines.append(f"Duplicate rows: {report['duplicates']}")
-
-        if report["constant_columns"]:
-            lines.append("")
-            lines.append("Constant columns:")
-            for col in report["constant_columns"]:
-                lines.append(f"  {col}")
+        pct = report["missing_pct"]
+        constant = report["constant_columns"]
+        lines = [
+            f"Rows: {report['rows']}",
+            f"Columns: {report['columns']}",
+            "",
+            "Missing values:",
+            *[
+                f"  {col}: {count} ({pct[col]}%)"
+                for col, count in report["missing"].items() if count > 0
+            ],
+            "",
+            f"Duplicate rows: {report['duplicates']}",
+            *(["", "Constant columns:", *[f"  {col}" for col in constant]] if constant else []),
+        ]
 
         QMessageBox.information(
             self,
@@ -200,16 +290,17 @@ class MainWindow(QMainWindow):
     # EXPORT
     # -----------------------------------------------------
     def export_csv(self):
-        path, _ = QFileDialog.getSaveFileName(self, "Export CSV", "", "CSV (*.csv)")
+        path = self._ask_path("Export CSV", "CSV (*.csv)", save=True)
         if path:
             self.controller.export_csv(path)
             QMessageBox.information(self, "Success", "CSV exported")
 
     def export_numpy(self):
-        path, _ = QFileDialog.getSaveFileName(self, "Export NumPy", "", "NumPy (*.npy)")
+        path = self._ask_path("Export NumPy", "NumPy (*.npy *.npz)", save=True)
         if path:
-            self.controller.export_numpy(path)
-            QMessageBox.information(self, "Success", "NumPy exported")
+            # mixed-dtype frames are written as .npz next to the chosen name
+            path = self.controller.export_numpy(path)
+            QMessageBox.information(self, "Success", f"NumPy exported to {path}")
 
     # -----------------------------------------------------
     # Data processing dialogs
@@ -218,61 +309,61 @@ class MainWindow(QMainWindow):
         dlg = DropColumnsDialog(self, self.controller.df)
         if dlg.exec():
             cols = dlg.get_columns()
-            df = self.controller.drop_columns(cols)
-            self.tableView.setModel(PandasModel(df))
+            self.controller.drop_columns(cols)
+            self._schedule_refresh()
 
     def show_add_column(self):
         dlg = AddColumnDialog(self)
         if dlg.exec():
             name, values = dlg.get_data()
-            df = self.controller.add_column(name, values)
-            self.tableView.setModel(PandasModel(df))
+            self.controller.add_column(name, values)
+            self._schedule_refresh()
 
 
     def show_add_column_expression(self):
         dlg = ExpressionDialog(self, self.controller.df)
         if dlg.exec():
             name, expr = dlg.get_data()
-            df = self.controller.add_column_expression(name, expr)
-            self.tableView.setModel(PandasModel(df))
+            self.controller.add_column_expression(name, expr)
+            self._schedule_refresh()
 
 
     def show_add_column_math(self):
         dlg = DerivedColumnDialog(self, self.controller.df)
         if dlg.exec():
             col1, col2, op, new_name = dlg.get_data()
-            df = self.controller.add_derived_column(col1, col2, op, new_name)
-            self.tableView.setModel(PandasModel(df))
+            self.controller.add_derived_column(col1, col2, op, new_name)
+            self._schedule_refresh()
 
 
     def show_group_aggregate(self):
         dlg = GroupAggregateDialog(self, self.controller.df)
         if dlg.exec():
             gcol, op = dlg.get_params()
-            df = self.controller.group_and_aggregate(gcol, op)
-            self.tableView.setModel(PandasModel(df))
+            self.controller.group_and_aggregate(gcol, op)
+            self._schedule_refresh()
 
     def show_rolling(self):
         dlg = RollingDialog(self)
         if dlg.exec():
             col, window, op = dlg.get_params()
-            df = self.controller.rolling(col, window, op)
-            self.tableView.setModel(PandasModel(df))
+            self.controller.rolling(col, window, op)
+            self._schedule_refresh()
 
     def show_resample(self):
         dlg = ResampleDialog(self, self.controller.df)
         if dlg.exec():
             col, rule, op = dlg.get_params()
-            df = self.controller.resample(col, rule, op)
-            self.tableView.setModel(PandasModel(df))
+            self.controller.resample(col, rule, op)
+            self._schedule_refresh()
 
 
     def show_preview_dialog(self):
-        if self.controller.df is None:
+        df = self.controller.df
+        if df is None:
             return
 
-        max_rows = len(self.controller.df)
-        dlg = PreviewDialog(self, max_rows)
+        dlg = PreviewDialog(self, len(df))
 
         if dlg.exec():
             rows, mode = dlg.get_params()
@@ -280,6 +371,7 @@ class MainWindow(QMainWindow):
                 rows,
                 tail=(mode == "tail")
             )
-            self.tableView.setModel(PandasModel(df))
+            self._preview_model.set_dataframe(df)
+            self._show_model(self._preview_model)
 
     
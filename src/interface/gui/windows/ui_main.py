@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+
+################################################################################
+## Form generated from reading UI file 'main_window.ui'
+##
+## Created by: Qt User Interface Compiler version 6.12.0
+##
+## WARNING! All changes made in this file will be lost when recompiling UI file!
+################################################################################
+
+from PySide6.QtCore import (QCoreApplication, QDate, QDateTime, QLocale,
+    QMetaObject, QObject, QPoint, QRect,
+    QSize, QTime, QUrl, Qt)
+from PySide6.QtGui import (QBrush, QColor, QConicalGradient, QCursor,
+    QFont, QFontDatabase, QGradient, QIcon,
+    QImage, QKeySequence, QLinearGradient, QPainter,
+    QPalette, QPixmap, QRadialGradient, QTransform)
+from PySide6.QtWidgets import (QAbstractItemView, QApplication, QGridLayout, QGroupBox,
+    QHeaderView, QLabel, QMainWindow, QPushButton,
+    QSizePolicy, QTableView, QVBoxLayout, QWidget)
+
+class Ui_MainWindow(object):
+    def setupUi(self, MainWindow):
+        if not MainWindow.objectName():
+            MainWindow.setObjectName(u"MainWindow")
+        MainWindow.setMinimumSize(QSize(900, 600))
+        self.centralwidget = QWidget(MainWindow)
+        self.centralwidget.setObjectName(u"centralwidget")
+        self.mainLayout = QVBoxLayout(self.centralwidget)
+        self.mainLayout.setSpacing(14)
+        self.mainLayout.setContentsMargins(12, 12, 12, 12)
+        self.mainLayout.setObjectName(u"mainLayout")
+        self.lblTitle = QLabel(self.centralwidget)
+        self.lblTitle.setObjectName(u"lblTitle")
+        self.lblTitle.setAlignment(Qt.AlignCenter)
+
+        self.mainLayout.addWidget(self.lblTitle)
+
+        self.groupActions = QGroupBox(self.centralwidget)
+        self.groupActions.setObjectName(u"groupActions")
+        self.gridButtons = QGridLayout(self.groupActions)
+        self.gridButtons.setObjectName(u"gridButtons")
+        self.gridButtons.setHorizontalSpacing(12)
+        self.gridButtons.setVerticalSpacing(10)
+        self.btnLoad = QPushButton(self.groupActions)
+        self.btnLoad.setObjectName(u"btnLoad")
+
+        self.gridButtons.addWidget(self.btnLoad, 0, 0, 1, 1)
+
+        self.btnPreviewHead = QPushButton(self.groupActions)
+        self.btnPreviewHead.setObjectName(u"btnPreviewHead")
+
+        self.gridButtons.addWidget(self.btnPreviewHead, 0, 1, 1, 1)
+
+        self.btnExportCSV = QPushButton(self.groupActions)
+        self.btnExportCSV.setObjectName(u"btnExportCSV")
+
+        self.gridButtons.addWidget(self.btnExportCSV, 1, 0, 1, 1)
+
+        self.btnExportNumPy = QPushButton(self.groupActions)
+        self.btnExportNumPy.setObjectName(u"btnExportNumPy")
+
+        self.gridButtons.addWidget(self.btnExportNumPy, 1, 1, 1, 1)
+
+        self.btnValidate = QPushButton(self.groupActions)
+        self.btnValidate.setObjectName(u"btnValidate")
+
+        self.gridButtons.addWidget(self.btnValidate, 2, 0, 1, 2)
+
+
+        self.mainLayout.addWidget(self.groupActions)
+
+        self.groupTable = QGroupBox(self.centralwidget)
+        self.groupTable.setObjectName(u"groupTable")
+        self.tableLayout = QVBoxLayout(self.groupTable)
+        self.tableLayout.setObjectName(u"tableLayout")
+        self.tableView = QTableView(self.groupTable)
+        self.tableView.setObjectName(u"tableView")
+        self.tableView.setAlternatingRowColors(True)
+        self.tableView.setSelectionBehavior(QAbstractItemView.SelectRows)
+        sizePolicy = QSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.tableView.sizePolicy().hasHeightForWidth())
+        self.tableView.setSizePolicy(sizePolicy)
+
+        self.tableLayout.addWidget(self.tableView)
+
+
+        self.mainLayout.addWidget(self.groupTable)
+
+        self.lblStatus = QLabel(self.centralwidget)
+        self.lblStatus.setObjectName(u"lblStatus")
+
+        self.mainLayout.addWidget(self.lblStatus)
+
+        MainWindow.setCentralWidget(self.centralwidget)
+
+        self.retranslateUi(MainWindow)
+
+        QMetaObject.connectSlotsByName(MainWindow)
+    # setupUi
+
+    def retranslateUi(self, MainWindow):
+        MainWindow.setWindowTitle(QCoreApplication.translate("MainWindow", u"ML Data Preparer", None))
+        self.lblTitle.setText(QCoreApplication.translate("MainWindow", u"Machine Learning Data Preparation", None))
+        self.lblTitle.setStyleSheet(QCoreApplication.translate("MainWindow", u"font-size:18px;font-weight:600;", None))
+        self.groupActions.setTitle(QCoreApplication.translate("MainWindow", u"Actions", None))
+        self.btnLoad.setText(QCoreApplication.translate("MainWindow", u"Load Data", None))
+        self.btnPreviewHead.setText(QCoreApplication.translate("MainWindow", u"Preview", None))
+        self.btnExportCSV.setText(QCoreApplication.translate("MainWindow", u"Export CSV", None))
+        self.btnExportNumPy.setText(QCoreApplication.translate("MainWindow", u"Export NumPy", None))
+        self.btnValidate.setText(QCoreApplication.translate("MainWindow", u"Validate", None))
+        self.groupTable.setTitle(QCoreApplication.translate("MainWindow", u"Dataset Preview", None))
+        self.lblStatus.setText(QCoreApplication.translate("MainWindow", u"Status: Ready", None))
+        self.lblStatus.setStyleSheet(QCoreApplication.translate("MainWindow", u"color:gray;", None))
+    # retranslateUi
+
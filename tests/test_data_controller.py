@@ -0,0 +1,117 @@
+import pytest
+import pandas as pd
+
+from src.interface.gui.controllers.data_controller import DataController
+
+
+# --- Fixtures ----------------------------------------------------------------
+
+@pytest.fixture
+def controller():
+    """Controller with a small grouped frame attached."""
+    c = DataController()
+    c.attach(pd.DataFrame({"k": ["x", "y", "x"], "v": [1, 2, 3]}), "data.csv")
+    return c
+
+
+# --- group_and_aggregate tests -----------------------------------------------
+
+def test_groupby_reused_after_undo(controller):
+    """Undo of an aggregation should keep the groupby of the restored frame."""
+    original = controller.df
+    grouped = controller._grouped(["k"])
+
+    controller.group_and_aggregate(["k"], {"v": ["sum"]})
+    controller.undo()
+    assert controller.df is original
+    assert controller._grouped(["k"]) is grouped
+
+    result = controller.group_and_aggregate(["k"], {"v": ["max"]})
+    assert result[("v", "max")].tolist() == [3, 2]
+
+
+def test_groupby_dropped_after_in_place_change(controller):
+    """Adding a column in place should not reuse groupby objects of the old layout."""
+    grouped = controller._grouped(["k"])
+    controller.add_column_expression("w", "v * 2")
+    assert controller._grouped(["k"]) is not grouped
+
+    result = controller.group_and_aggregate(["k"], {"w": ["sum"]})
+    assert result[("w", "sum")].tolist() == [8, 4]
+
+
+def test_groupby_cache_releases_replaced_frames(controller):
+    """Frames replaced by an operation should not stay alive in the groupby cache."""
+    replaced = controller.df
+    controller._grouped(["k"])
+    controller.filter_where("k", "x")
+    assert all(frame is not replaced for frame, _ in controller._gb_cache.values())
+
+    controller.group_and_aggregate(["k"], {"v": ["sum"]})
+    controller.undo()
+    filtered = controller.df
+    controller._grouped(["k"])
+    controller.redo()
+    # redo keeps a copy of the filtered frame, not the frame itself
+    assert all(frame is not filtered for frame, _ in controller._gb_cache.values())
+
+
+# --- filter_where / drop_rows_by_condition tests ------------------------------
+
+def test_filter_where_matches_displayed_datetime_text():
+    """Value filters should compare datetimes with their displayed text."""
+    c = DataController()
+    c.attach(pd.DataFrame({
+        "t": pd.to_datetime(["2024-01-01", "2024-01-02 10:00", None], format="mixed"),
+        "v": [1, 2, 3],
+    }), "data.csv")
+
+    assert c.filter_where("t", "2024-01-01 00:00:00")["v"].tolist() == [1]
+    c.undo()
+    assert c.drop_rows_by_condition("t", "NaT")["v"].tolist() == [1, 2]
+
+
+# --- undo / redo of column history entries -----------------------------------
+
+@pytest.mark.parametrize("operation", [
+    lambda c: c.add_column("n", [7, 8, 9]),
+    lambda c: c.add_column("v", [7, 8, 9]),
+    lambda c: c.add_derived_column("v", "v", "sum", "s"),
+    lambda c: c.add_derived_column("v", "v", "prod", "v"),
+    lambda c: c.add_column_expression("e", "v * 2"),
+    lambda c: c.add_column_expression("v", "v * 2"),
+    lambda c: c.rolling("v", 2, "sum"),
+    lambda c: c.ensure_id("id", set_as_index=False),
+    lambda c: c.ensure_id("id"),
+    lambda c: c.drop_columns(["k", "w"]),
+    lambda c: c.drop_columns(["v"]),
+])
+def test_undo_redo_round_trip(operation):
+    """Undo should restore the frame before an operation and redo the one after it."""
+    c = DataController()
+    c.attach(
+        pd.DataFrame({"k": ["x", "y", "x"], "v": [1, 2, 3], "w": [4.0, 5.0, 6.0]}),
+        "data.csv"
+    )
+    before = c.df.copy()
+    after = operation(c).copy()
+
+    pd.testing.assert_frame_equal(c.undo(), before)
+    pd.testing.assert_frame_equal(c.redo(), after)
+    pd.testing.assert_frame_equal(c.undo(), before)
+
+
+def test_failed_add_leaves_history_unchanged(controller):
+    """A failing column operation should not add an undo entry or drop redo."""
+    controller.add_column("n", [1, 2, 3])
+    controller.undo()
+
+    with pytest.raises(KeyError):
+        controller.add_derived_column("v", "missing", "sum", "s")
+    with pytest.raises(ValueError):
+        controller.add_column_expression("e", "v +")
+    assert list(controller.df.columns) == ["k", "v"]
+    assert controller._undo_stack == []
+
+    controller.redo()
+    assert list(controller.df.columns) == ["k", "v", "n"]
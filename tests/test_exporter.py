@@ -1,16 +1,18 @@
 import pytest
 import pandas as pd
 import numpy as np
-import os
 
 from src.core.exporter import export_to_csv, export_to_numpy
 
 
 # --- Fixtures ----------------------------------------------------------------
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def simple_df():
-    """Reusable DataFrame for export tests."""
+    """Reusable DataFrame for export tests.
+
+    Shared by all tests - take simple_df.copy() before mutating it.
+    """
     return pd.DataFrame({"a": [1, 2, 3], "b": [4, 5, 6]})
 
 
@@ -44,6 +46,16 @@ def test_export_to_csv_empty_dataframe(tmp_path):
         export_to_csv(df, file)
 
 
+def test_export_to_csv_chunked_matches_single_write(tmp_path):
+    """export_to_csv with chunksize should write the same file as without."""
+    df = pd.DataFrame({"a": range(10), "b": [x / 3 for x in range(10)]})
+    whole, chunked = tmp_path / "whole.csv", tmp_path / "chunked.csv"
+    export_to_csv(df, whole)
+    export_to_csv(df, chunked, chunksize=3)
+
+    assert chunked.read_text() == whole.read_text()
+
+
 # --- export_to_numpy tests ---------------------------------------------------
 
 def test_export_to_numpy_creates_file(tmp_path, simple_df):
@@ -66,6 +78,28 @@ def test_export_to_numpy_with_columns(tmp_path, simple_df):
     assert arr[:, 0].tolist() == [1, 2, 3]
 
 
+def test_export_to_numpy_mixed_dtypes_keeps_columns(tmp_path):
+    """export_to_numpy should save mixed frames per column without object casts."""
+    df = pd.DataFrame({"file": ["x", "y"], "n": [1, 2], "f": [0.5, np.nan]})
+    written = export_to_numpy(df, tmp_path / "mixed.npy")
+    assert written == str(tmp_path / "mixed.npz")
+
+    with np.load(written, allow_pickle=True) as npz:
+        assert npz["columns"].tolist() == ["file", "n", "f"]
+        assert npz["arr_1"].dtype == np.int64
+        assert npz["arr_2"].dtype == np.float64
+
+
+def test_export_to_numpy_int_and_bool_columns(tmp_path):
+    """export_to_numpy should archive int + bool frames instead of failing on object arrays."""
+    df = pd.DataFrame({"n": [1, 2], "flag": [True, False]})
+    written = export_to_numpy(df, tmp_path / "flags.npy")
+
+    with np.load(written) as npz:
+        assert npz["arr_0"].dtype == np.int64
+        assert npz["arr_1"].dtype == np.bool_
+
+
 def test_export_to_numpy_with_missing_column(tmp_path, simple_df):
     """export_to_numpy should raise KeyError if column does not exist."""
     file = tmp_path / "fail.npy"
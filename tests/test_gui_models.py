@@ -0,0 +1,98 @@
+import os
+
+import pytest
+import pandas as pd
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+QtWidgets = pytest.importorskip("PySide6.QtWidgets")
+
+from src.interface.gui.models.pandas_model import PandasModel
+
+
+# --- Fixtures ----------------------------------------------------------------
+
+@pytest.fixture(scope="module")
+def qapp():
+    """One QApplication for all GUI tests."""
+    return QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+
+
+@pytest.fixture
+def simple_df():
+    return pd.DataFrame({"a": [1, 2, 3], "b": [4, 5, 6]})
+
+
+# --- PandasModel tests -------------------------------------------------------
+
+def test_model_refreshes_values_overwritten_in_place(qapp, simple_df):
+    """set_dataframe should show new values of the same frame without a reset."""
+    model = PandasModel(simple_df)
+    assert model.data(model.index(0, 1)) == "4"
+    resets, changes = [], []
+    model.modelReset.connect(lambda: resets.append(True))
+    model.dataChanged.connect(lambda *args: changes.append(True))
+
+    simple_df["b"] = ["9", "9", "9"]
+    model.set_dataframe(simple_df)
+    assert resets == [] and changes == [True]
+    assert model.data(model.index(0, 1)) == "9"
+
+
+def test_model_resets_when_frame_grows_in_place(qapp, simple_df):
+    """set_dataframe should reset the model when the same frame gained a column."""
+    model = PandasModel(simple_df)
+    resets = []
+    model.modelReset.connect(lambda: resets.append(True))
+
+    simple_df["c"] = simple_df["a"] + simple_df["b"]
+    model.set_dataframe(simple_df)
+    assert resets == [True]
+    assert model.columnCount() == 3
+
+
+# --- MainWindow tests --------------------------------------------------------
+
+def test_window_refresh_shows_in_place_columns(qapp, simple_df):
+    """The table should show columns the controller adds to its frame in place."""
+    from PySide6.QtCore import Qt
+    from src.interface.gui.windows.main_window import MainWindow
+
+    window = MainWindow()
+    window.controller.attach(simple_df, "data.csv")
+    window._do_refresh()
+    resets = []
+    window.model.modelReset.connect(lambda: resets.append(True))
+
+    window.controller.add_derived_column("a", "b", "sum", "a_plus_b")
+    window._do_refresh()
+    header = window.tableView.horizontalHeader()
+    assert resets == [True]
+    assert header.count() == 3
+    assert window.tableView.model().headerData(2, Qt.Horizontal, Qt.DisplayRole) == "a_plus_b"
+
+    window.controller.rolling("a", 2, "mean")
+    window._do_refresh()
+    assert resets == [True, True]
+    assert header.count() == window.controller.df.shape[1]
+    window.close()
+
+
+def test_window_refresh_shows_overwritten_column(qapp, simple_df):
+    """The table should show values the controller writes over an existing column."""
+    from src.interface.gui.windows.main_window import MainWindow
+
+    window = MainWindow()
+    window.controller.attach(simple_df, "data.csv")
+    window._do_refresh()
+    model = window.tableView.model()
+    assert model.data(model.index(0, 1)) == "4"
+
+    window.controller.add_column("b", ["9", "9", "9"])
+    window._do_refresh()
+    model = window.tableView.model()
+    assert model.data(model.index(0, 1)) == "9"
+
+    window.controller.add_derived_column("a", "a", "sum", "b")
+    window._do_refresh()
+    assert window.tableView.model().data(model.index(2, 1)) == "6"
+    window.close()
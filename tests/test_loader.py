@@ -1,20 +1,27 @@
 import pytest
+import numpy as np
 import pandas as pd
 
 from src.core.loader import (
     load_csv,
+    load_csv_projected,
     preview_dataframe,
     get_dataframe_stat_summary,
     set_column_names,
-    validate_csv_format
+    validate_csv_format,
+    optimize_dtypes
 )
+from src.core.exporter import export_to_numpy
 
 
 # --- Fixtures ----------------------------------------------------------------
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def simple_df():
-    """A small reusable DataFrame for preview and summary tests."""
+    """A small reusable DataFrame for preview and summary tests.
+
+    Shared by all tests - take simple_df.copy() before mutating it.
+    """
     return pd.DataFrame({"a": [1, 2, 3], "b": [4, 5, None]})
 
 
@@ -54,6 +61,155 @@ def test_load_csv_with_various_separators(tmp_path, sep, content):
     assert df.shape == (1, 2)
 
 
+@pytest.mark.parametrize("engine", ["c", "python"])
+def test_load_csv_with_engine(tmp_path, engine):
+    """load_csv should pass the parser engine through to pandas."""
+    file = tmp_path / "data.csv"
+    file.write_text("name,age\nAlice,30\nBob,25")
+
+    df = load_csv(str(file), engine=engine)
+    assert df.shape == (2, 2)
+    assert df["age"].tolist() == [30, 25]
+
+
+def test_load_csv_with_nrows_and_dtype(tmp_path):
+    """load_csv should read only `nrows` rows with the given dtypes."""
+    file = tmp_path / "data.csv"
+    file.write_text("name,age\nAlice,30\nBob,25\nAlice,41")
+
+    df = load_csv(str(file), nrows=2, dtype={"name": "category"})
+    assert df.shape == (2, 2)
+    assert isinstance(df["name"].dtype, pd.CategoricalDtype)
+
+
+def test_load_csv_reads_exported_npz(tmp_path):
+    """load_csv should restore names and dtypes of a per-column NumPy export."""
+    df = pd.DataFrame({"name": ["a", "b"], "n": [1, 2]})
+    file = export_to_numpy(df, tmp_path / "mixed.npy")
+
+    loaded = load_csv(file)
+    assert list(loaded.columns) == ["name", "n"]
+    assert loaded["n"].dtype == np.int64
+    assert loaded["name"].tolist() == ["a", "b"]
+
+
+def test_load_csv_pyarrow_matches_default(tmp_path):
+    """load_csv with engine='pyarrow' should match pandas' pyarrow engine."""
+    pytest.importorskip("pyarrow")
+    file = tmp_path / "data.csv"
+    file.write_text("name,age,city\nAlice,30,\nBob,,Oslo\nAlice,41,Oslo")
+
+    df = load_csv(str(file), engine="pyarrow")
+    pd.testing.assert_frame_equal(df, pd.read_csv(file, engine="pyarrow"))
+
+    df = load_csv(str(file), engine="pyarrow", dtype={"city": "category"})
+    assert isinstance(df["city"].dtype, pd.CategoricalDtype)
+    assert df["city"].isna().tolist() == [True, False, False]
+
+
+@pytest.mark.parametrize("engine", ["pyarrow", "auto"])
+def test_load_csv_pyarrow_matches_pandas_names_and_dtypes(tmp_path, engine):
+    """The pyarrow reader should load a file exactly like the C parser."""
+    pytest.importorskip("pyarrow")
+    file = tmp_path / "data.csv"
+    file.write_text(
+        "a,a,a.1,when,day,,na,empty\n"
+        "1,2,3,2024-01-01 10:00:00,2024-01-02,x,None,\n"
+        "4,5,6,2024-01-03 11:30:00,2024-01-04,y,<NA>,\n"
+    )
+
+    df = load_csv(str(file), engine=engine)
+    pd.testing.assert_frame_equal(df, load_csv(str(file), engine="c"))
+    assert list(df.columns[5:]) == ["Unnamed: 5", "na", "empty"]
+    assert df["empty"].dtype == np.float64
+
+    df = load_csv(str(file), engine=engine, usecols=["when", "a.2"])
+    assert list(df.columns) == ["a.2", "when"]
+    assert df["when"].tolist() == ["2024-01-01 10:00:00", "2024-01-03 11:30:00"]
+
+    # beyond int64: pyarrow would give lossy float64, pandas uint64
+    file.write_text("id,n\n18446744073709551615,1\n1,2\n")
+    df = load_csv(str(file), engine=engine)
+    pd.testing.assert_frame_equal(df, load_csv(str(file), engine="c"))
+    assert df["id"].dtype == np.uint64
+
+
+def test_load_csv_auto_engine_falls_back(tmp_path):
+    """engine='auto' should fall back to pandas when pyarrow rejects the file."""
+    file = tmp_path / "short_row.csv"
+    # pyarrow rejects rows with too few fields, pandas pads them with NaN
+    file.write_text('a,b\nx,1\n"y,2"\n')
+
+    df = load_csv(str(file), engine="auto")
+    assert df["a"].tolist() == ["x", "y,2"]
+
+    file.write_text("a,b\n1,x\n-,y\n")
+    df = load_csv(str(file), engine="auto", na_values=["-"])
+    assert df["a"].isna().tolist() == [False, True]
+
+
+@pytest.mark.parametrize("engine", [None, "auto"])
+def test_load_csv_projects_columns(tmp_path, engine):
+    """load_csv should read only `usecols`, in file order, and parse dates."""
+    file = tmp_path / "data.csv"
+    file.write_text("a,b,when\n1,x,2024-01-01\n2,y,2024-01-02\n")
+
+    df = load_csv_projected(str(file), ["when", "a"], engine=engine)
+    assert list(df.columns) == ["a", "when"]
+
+    df = load_csv(str(file), engine=engine, usecols=["when"], parse_dates=["when"])
+    assert pd.api.types.is_datetime64_any_dtype(df["when"])
+
+    with pytest.raises(ValueError):
+        load_csv(str(file), engine=engine, usecols=["missing"])
+
+
+@pytest.mark.parametrize("engine", [None, "auto"])
+def test_load_csv_row_filter(tmp_path, monkeypatch, engine):
+    """load_csv should keep only rows passing `row_filter`, across chunks."""
+    monkeypatch.setattr("src.core.loader.FILTER_CHUNK_ROWS", 2)
+    file = tmp_path / "data.csv"
+    file.write_text("name,age\nA,30\nB,40\nC,50\nD,20\nE,45\n")
+
+    df = load_csv(str(file), engine=engine, row_filter="age > 35")
+    assert df["name"].tolist() == ["B", "C", "E"]
+    assert df.index.tolist() == [0, 1, 2]
+
+    df = load_csv(str(file), engine=engine, row_filter=lambda d: d["age"] > 100)
+    assert df.empty and list(df.columns) == ["name", "age"]
+
+
+def test_load_csv_row_filter_streams_pyarrow_batches(tmp_path, monkeypatch):
+    """A pandas row_filter should be applied per pyarrow block, not after a full read."""
+    pacsv = pytest.importorskip("pyarrow.csv")
+    monkeypatch.setattr("src.core.loader.ARROW_BLOCK_SIZE", 1024)
+    monkeypatch.setattr(pacsv, "read_csv", lambda *a, **k: pytest.fail("full read"))
+    file = tmp_path / "data.csv"
+    file.write_text("n,kind\n" + "".join(f"{i},k{i % 3}\n" for i in range(2000)))
+
+    df = load_csv(
+        str(file), engine="pyarrow", dtype={"kind": "category"},
+        row_filter="n % 500 == 1"
+    )
+    assert df["n"].tolist() == [1, 501, 1001, 1501]
+    assert df["kind"].tolist() == ["k1", "k0", "k2", "k1"]
+    assert isinstance(df["kind"].dtype, pd.CategoricalDtype)
+    assert df.index.tolist() == [0, 1, 2, 3]
+
+
+def test_load_csv_row_filter_arrow_expression(tmp_path):
+    """load_csv should apply a pyarrow Expression filter with the pyarrow reader only."""
+    pc = pytest.importorskip("pyarrow.compute")
+    file = tmp_path / "data.csv"
+    file.write_text("name,age\nA,30\nB,40\n")
+
+    df = load_csv(str(file), engine="auto", row_filter=pc.field("age") > 35)
+    assert df["name"].tolist() == ["B"]
+
+    with pytest.raises(ValueError):
+        load_csv(str(file), row_filter=pc.field("age") > 35)
+
+
 def test_load_csv_with_no_header(tmp_path):
     """load_csv should assign numeric column names if header=None is passed."""
     file = tmp_path / "test.csv"
@@ -118,6 +274,32 @@ def test_load_csv_custom_na_values(tmp_path):
     assert df.isna().sum().iloc[0] == 2
 
 
+# --- optimize_dtypes tests ----------------------------------------------------
+
+def test_optimize_dtypes_downcasts_large_frame():
+    """optimize_dtypes should shrink ints, lossless floats and repeated text."""
+    n = 20
+    df = pd.DataFrame({
+        "i": list(range(n)),
+        "f": [0.5] * n,
+        "g": [0.1] * n,
+        "cat": ["x", "y"] * (n // 2),
+        "txt": [f"row{i}" for i in range(n)],
+    })
+    optimize_dtypes(df, min_rows=10)
+    assert df["i"].dtype == "int8"
+    assert df["f"].dtype == "float32"
+    assert df["g"].dtype == "float64"
+    assert df["cat"].dtype == "category"
+    assert df["txt"].dtype == "object"
+
+
+def test_optimize_dtypes_keeps_small_frame(simple_df):
+    """optimize_dtypes should leave frames below min_rows untouched."""
+    df = optimize_dtypes(simple_df.copy())
+    assert df.dtypes.equals(simple_df.dtypes)
+
+
 # --- preview_dataframe tests --------------------------------------------------
 
 def test_preview_dataframe_head(simple_df):
@@ -141,6 +323,7 @@ def test_get_dataframe_stat_summary_returns_expected_keys(simple_df):
     assert summary["row_count"] == 3
     assert summary["column_count"] == 2
     assert summary["missing_values"] == {"a": 0, "b": 1}
+    assert summary["memory_bytes"] == simple_df.memory_usage().sum()
 
 
 # --- set_column_names tests --------------------------------------------------
@@ -160,6 +343,14 @@ def test_set_column_names_updates_columns():
     assert list(df2.columns) == new_names
 
 
+def test_set_column_names_leaves_input_unchanged():
+    """set_column_names should not rename the frame it was given."""
+    df = pd.DataFrame({"a": [1, 2], "b": [3, 4]})
+    df2 = set_column_names(df, ["x", "y"])
+    assert list(df.columns) == ["a", "b"]
+    assert df2["x"].tolist() == [1, 2]
+
+
 def test_set_column_names_with_mismatched_length():
     """set_column_names should raise ValueError if number of names != number of columns."""
     df = pd.DataFrame([[1, 2], [3, 4]])
@@ -207,3 +398,19 @@ def test_validate_csv_format_empty_file(tmp_path):
     with pytest.raises(ValueError):
         validate_csv_format(str(file))
 
+
+
+def test_validate_csv_format_quoted_separator(tmp_path):
+    """validate_csv_format should not count separators inside quotes."""
+    file = tmp_path / "quoted.csv"
+    file.write_text('name,city\n"Doe, John",Oslo\n')
+    assert validate_csv_format(str(file), expected_cols=2)
+
+
+def test_validate_csv_format_max_rows_to_check(tmp_path):
+    """validate_csv_format should stop after max_rows_to_check data rows."""
+    file = tmp_path / "late_error.csv"
+    file.write_text("a,b\n1,2\n3,4\n5,6,7\n")
+    assert validate_csv_format(str(file), expected_cols=2, max_rows_to_check=2)
+    with pytest.raises(ValueError):
+        validate_csv_format(str(file), expected_cols=2)
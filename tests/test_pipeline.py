@@ -0,0 +1,81 @@
+import pytest
+import pandas as pd
+
+from src.core.pipeline import Pipeline
+from src.core.processor import (
+    add_column,
+    add_column_from_expression,
+    apply_transformation,
+    drop_columns,
+    filter_rows,
+)
+
+
+# --- Fixtures ----------------------------------------------------------------
+
+@pytest.fixture
+def simple_df():
+    """Reusable small DataFrame for pipeline tests."""
+    return pd.DataFrame({"a": [1, 2, 3, 4], "b": [4, 5, 6, 7], "c": ["w", "x", "y", "z"]})
+
+
+# --- Pipeline tests ----------------------------------------------------------
+
+def test_pipeline_matches_eager_calls(simple_df):
+    """Pipeline.collect should give the same frame as calling the functions in order."""
+    expected = add_column_from_expression(simple_df.copy(), "s", "a + b")
+    expected = add_column(expected, "n", [10, 20, 30, 40])
+    expected = apply_transformation(expected, "a", lambda v: v * 10)
+    expected = filter_rows(expected, "b > 4")
+    expected = drop_columns(expected, ["c"])
+
+    result = (
+        Pipeline(simple_df)
+        .add_column_from_expression("s", "a + b")
+        .add_column("n", [10, 20, 30, 40])
+        .apply_transformation("a", lambda v: v * 10)
+        .filter_rows("b > 4")
+        .drop_columns(["c"])
+        .collect()
+    )
+    pd.testing.assert_frame_equal(result, expected)
+    assert list(simple_df.columns) == ["a", "b", "c"]
+
+
+def test_pipeline_skips_work_on_dropped_columns(simple_df):
+    """Transformations of columns dropped later should never run."""
+    def fail(value):
+        raise AssertionError("dropped column was transformed")
+
+    result = (
+        Pipeline(simple_df)
+        .apply_transformation("c", fail)
+        .add_column_from_expression("s", "a + b")
+        .drop_columns(["c", "s"])
+        .collect()
+    )
+    assert list(result.columns) == ["a", "b"]
+
+
+def test_pipeline_filters_before_transformation(simple_df):
+    """Row filters that do not read the transformed column should run first."""
+    seen = []
+
+    def record(value):
+        seen.append(value)
+        return value
+
+    result = (
+        Pipeline(simple_df)
+        .apply_transformation("a", record)
+        .filter_rows("b >= 6")
+        .collect()
+    )
+    assert seen == [3, 4]
+    assert result["a"].tolist() == [3, 4]
+
+
+def test_pipeline_missing_column_raises(simple_df):
+    """Pipeline.collect should raise KeyError for unknown columns like the eager calls."""
+    with pytest.raises(KeyError):
+        Pipeline(simple_df).drop_columns(["missing"]).collect()
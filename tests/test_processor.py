@@ -1,4 +1,11 @@
+import math
+import os
+import subprocess
+import sys
+from pathlib import Path
+
 import pytest
+import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
 
@@ -8,6 +15,7 @@ from src.core.processor import (
     apply_transformation,
     filter_rows,
     create_column_from_existing,
+    add_column_from_expression,
     drop_rows_by_index,
     drop_rows_by_condition,
     drop_empty_columns,
@@ -19,6 +27,9 @@ from src.core.processor import (
 )
 
 
+ROOT = Path(__file__).resolve().parents[1]
+
+
 # --- Fixtures ----------------------------------------------------------------
 
 @pytest.fixture
@@ -51,6 +62,57 @@ def test_create_column_from_existing_with_sum(simple_df):
     assert df2["sum_ab"].tolist() == [5, 7, 9]
 
 
+def test_create_column_from_existing_with_expr(simple_df):
+    """create_column_from_existing should accept an arithmetic expression string."""
+    df2 = create_column_from_existing(simple_df, "sum_ab", expr="a + b")
+    assert df2["sum_ab"].tolist() == [5, 7, 9]
+    with pytest.raises(ValueError):
+        create_column_from_existing(simple_df, "x")
+
+
+# --- add_column_from_expression tests ----------------------------------------
+
+def test_add_column_from_expression_repeated(simple_df):
+    """add_column_from_expression should give the same result when reused."""
+    df2 = add_column_from_expression(simple_df, "avg", "(a + b) / 2")
+    df3 = add_column_from_expression(df2, "avg2", "(a + b) / 2")
+    assert df2["avg"].tolist() == [2.5, 3.5, 4.5]
+    assert df3["avg2"].tolist() == [2.5, 3.5, 4.5]
+
+
+@pytest.mark.parametrize("expression", [
+    "a // b", "a % b", "abs(a - 5)", "a / b", "a ** 2", "x // b", "x % b",
+    "sqrt(a) + x", "(a > 1) & (b > 1)", "u * 2", "u / 2", "u - a", "u + x",
+])
+def test_add_column_from_expression_matches_pandas_eval(expression):
+    """add_column_from_expression should give DataFrame.eval's values and dtype."""
+    df = pd.DataFrame({
+        "a": [1, 7, 3], "b": [2, 2, 0], "x": [1.5, -2.0, 0.0],
+        "u": np.array([1, 2, 2**63], dtype=np.uint64),
+    })
+    expected = df.eval(expression, engine="python")
+    result = add_column_from_expression(df.copy(), "r", expression)["r"]
+    pd.testing.assert_series_equal(result, expected, check_names=False)
+
+
+def test_add_column_from_expression_falls_back_on_numexpr_error(simple_df, monkeypatch):
+    """A numexpr program failing at run time should fall back to DataFrame.eval."""
+    def broken(*arrays):
+        raise TypeError("could not be cast")
+
+    monkeypatch.setattr(
+        "src.core.processor._compile_expression", lambda df, expr: (broken, ("a", "b"))
+    )
+    df2 = add_column_from_expression(simple_df, "s", "a + b")
+    assert df2["s"].tolist() == [5, 7, 9]
+
+
+def test_add_column_from_expression_invalid(simple_df):
+    """add_column_from_expression should raise ValueError for unknown names."""
+    with pytest.raises(ValueError):
+        add_column_from_expression(simple_df, "bad", "a + missing")
+
+
 # --- drop_rows_by_index tests ------------------------------------------------
 
 def test_drop_rows_by_index_removes_rows(simple_df):
@@ -59,18 +121,49 @@ def test_drop_rows_by_index_removes_rows(simple_df):
     assert df2["a"].tolist() == [2]
 
 
+def test_drop_rows_by_index_uses_labels():
+    """drop_rows_by_index should drop by index label and reject unknown labels."""
+    df = pd.DataFrame({"a": [1, 2, 3]}, index=[10, 20, 30])
+    assert drop_rows_by_index(df, [20]).index.tolist() == [10, 30]
+    with pytest.raises(KeyError):
+        drop_rows_by_index(df, [0])
+
+
+def test_drop_rows_by_index_with_duplicate_labels():
+    """drop_rows_by_index should drop all rows of a repeated label and report missing ones."""
+    df = pd.DataFrame({"a": [1, 2, 3, 4]}, index=[10, 10, 20, 30])
+    assert drop_rows_by_index(df, [10, 30])["a"].tolist() == [3]
+    with pytest.raises(KeyError, match="40"):
+        drop_rows_by_index(df, [10, 40])
+
+
+def test_drop_rows_by_index_with_multiindex():
+    """drop_rows_by_index should drop first-level labels of a MultiIndex."""
+    index = pd.MultiIndex.from_tuples([("x", 1), ("x", 2), ("y", 1)])
+    df = pd.DataFrame({"a": [1, 2, 3]}, index=index)
+    assert drop_rows_by_index(df, ["x"])["a"].tolist() == [3]
+    with pytest.raises(KeyError):
+        drop_rows_by_index(df, ["z"])
+
+
 # --- drop_rows_by_condition tests --------------------------------------------
 
 def test_drop_rows_by_condition_removes_matching(simple_df):
     """drop_rows_by_condition should drop rows where condition is True."""
-    df2 = drop_rows_by_condition(simple_df, lambda row: row["a"] < 3)
+    df2 = drop_rows_by_condition(simple_df, lambda df: df["a"] < 3)
     assert df2["a"].tolist() == [3]
 
 def test_drop_rows_by_condition(simple_df):
-    df2 = drop_rows_by_condition(simple_df, lambda row: row["b"] > 4)
+    df2 = drop_rows_by_condition(simple_df, lambda df: df["b"] > 4)
     assert df2["b"].tolist() == [4]
 
 
+def test_drop_rows_by_condition_with_expression(simple_df):
+    """drop_rows_by_condition should accept a DataFrame.eval expression."""
+    df2 = drop_rows_by_condition(simple_df, "a < 3 and b > 3")
+    assert df2["a"].tolist() == [3]
+
+
 # --- drop_empty_columns tests ------------------------------------------------
 
 def test_drop_empty_columns_removes_all_nan_columns(df_with_missing):
@@ -80,6 +173,12 @@ def test_drop_empty_columns_removes_all_nan_columns(df_with_missing):
     assert "x" in df2.columns
 
 
+def test_drop_empty_columns_keeps_columns_with_late_values():
+    """Columns whose first value is missing should be kept if any later value is set."""
+    df = pd.DataFrame({"a": [None, None, "x"], "b": [np.nan] * 3, "c": [1, 2, 3]})
+    assert drop_empty_columns(df).columns.tolist() == ["a", "c"]
+
+
 # --- math_operation tests ----------------------------------------------------
 
 @pytest.mark.parametrize("op,expected", [
@@ -94,6 +193,20 @@ def test_math_operation_valid_ops(simple_df, op, expected):
     assert df2["result"].tolist() == expected
 
 
+@pytest.mark.parametrize("op", ["sum", "diff", "prod", "mean"])
+def test_math_operation_float_with_nan(op):
+    """math_operation should match pandas arithmetic on floats with NaN."""
+    df = pd.DataFrame({"a": [1.5, np.nan, 3.0], "b": [2.0, 4.0, np.nan]})
+    expected = {
+        "sum": df["a"] + df["b"],
+        "diff": df["a"] - df["b"],
+        "prod": df["a"] * df["b"],
+        "mean": (df["a"] + df["b"]) / 2,
+    }[op]
+    df2 = math_operation(df, "a", "b", op, "result")
+    pd.testing.assert_series_equal(df2["result"], expected, check_names=False)
+
+
 def test_math_operation_with_invalid_op(simple_df):
     """math_operation should raise ValueError if operation is not supported."""
     with pytest.raises(ValueError):
@@ -105,9 +218,67 @@ def test_math_operation_with_missing_column(simple_df):
     with pytest.raises(KeyError):
         math_operation(simple_df, "a", "nonexistent", "sum", "result")
 
+
+def test_kernel_warmup_alongside_math_operation():
+    """Kernel warmup on another thread must not abort numba's workqueue layer."""
+    pytest.importorskip("numba")
+    script = (
+        "import threading, numpy as np, pandas as pd\n"
+        "from src.core import kernels\n"
+        "from src.core.processor import math_operation\n"
+        "kernels.launch_threads()\n"
+        "t = threading.Thread(target=kernels.warmup); t.start()\n"
+        "df = pd.DataFrame({'a': np.arange(10000.0), 'b': np.ones(10000)})\n"
+        "while t.is_alive(): math_operation(df, 'a', 'b', 'sum', 's')\n"
+        "t.join()\n"
+    )
+    env = dict(os.environ, NUMBA_THREADING_LAYER="workqueue")
+    result = subprocess.run(
+        [sys.executable, "-c", script], cwd=ROOT, env=env, capture_output=True
+    )
+    assert result.returncode == 0, result.stderr.decode()
+
+
 def test_apply_transformation(simple_df):
     df2 = apply_transformation(simple_df, "a", lambda x: x * 10)
     assert df2["a"].tolist() == [10, 20, 30]
+
+
+@pytest.mark.parametrize("func,expected", [
+    (lambda x: x * 10, [10, 20, 30]),
+    (lambda x: x ** 2 + 0.5, [1.5, 4.5, 9.5]),
+    (lambda x: str(x), ["1", "2", "3"]),
+])
+def test_apply_transformation_numba_engine(simple_df, func, expected):
+    """engine='numba' should match the default path, falling back if needed."""
+    pytest.importorskip("numba")
+    df2 = apply_transformation(simple_df.copy(), "a", func, engine="numba")
+    assert df2["a"].tolist() == expected
+
+
+@pytest.mark.parametrize("column,func", [
+    ("a", math.sqrt),
+    ("a", np.sqrt),
+    ("a", lambda x: x ** -1),
+    ("a", lambda x: x * 2**62),
+    ("a", lambda x: x & 1),
+    ("flag", lambda x: x * 2),
+    ("flag", lambda x: not x),
+    ("small", lambda x: x / 3),
+])
+def test_apply_transformation_numba_engine_matches_apply(column, func):
+    """engine='numba' should give Series.apply's values and dtype or fall back to it."""
+    pytest.importorskip("numba")
+    df = pd.DataFrame({
+        "a": [1, 2, 3],
+        "flag": [True, False, True],
+        "small": np.array([1.5, 2.0, 3.0], dtype=np.float32),
+    })
+    expected = df[column].apply(func)
+    result = apply_transformation(df.copy(), column, func, engine="numba")[column]
+    pd.testing.assert_series_equal(result, expected)
+
+
 # --- group_and_aggregate tests -----------------------------------------------
 
 def test_group_and_aggregate_with_single_function(group_df):
@@ -135,6 +306,36 @@ def test_group_and_aggregate_multiple_metrics(group_df):
     assert "max" in result["value"].columns
 
 
+def test_group_and_aggregate_reuses_grouped(group_df):
+    """group_and_aggregate should accept a prebuilt groupby object."""
+    grouped = group_df.groupby("category")
+    first = group_and_aggregate(group_df, "category", {"value": ["sum"]}, grouped=grouped)
+    second = group_and_aggregate(group_df, "category", {"value": ["max"]}, grouped=grouped)
+    assert first[("value", "sum")].tolist() == [30, 70]
+    assert second[("value", "max")].tolist() == [20, 40]
+
+
+def test_group_and_aggregate_named(group_df):
+    """group_and_aggregate with named=True should return flat column names."""
+    result = group_and_aggregate(
+        group_df, "category", {"value": ["sum", "max"]}, named=True
+    )
+    assert list(result.columns) == ["category", "value_sum", "value_max"]
+    assert result["value_sum"].tolist() == [30, 70]
+
+
+@pytest.mark.parametrize("agg_funcs", [
+    {"value": ["sum", "mean"]},
+    {"value": "max"},
+])
+def test_group_and_aggregate_numba_engine(group_df, agg_funcs):
+    """group_and_aggregate with engine='numba' should match the default path."""
+    pytest.importorskip("numba")
+    expected = group_and_aggregate(group_df, "category", agg_funcs)
+    result = group_and_aggregate(group_df, "category", agg_funcs, engine="numba")
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+
+
 # --- filter_text tests -------------------------------------------------------
 
 def test_filter_text_with_contains():
@@ -151,6 +352,25 @@ def test_filter_text_with_startswith():
     assert result["name"].tolist() == ["Alice"]
 
 
+def test_filter_text_contains_is_literal_by_default():
+    """filter_text 'contains' should treat the pattern as plain text unless regex=True."""
+    df = pd.DataFrame({"name": ["a.b", "axb"]})
+    assert filter_text(df, "name", "contains", "a.b")["name"].tolist() == ["a.b"]
+    assert filter_text(df, "name", "contains", "a.b", regex=True)["name"].tolist() == ["a.b", "axb"]
+
+
+@pytest.mark.parametrize("mode,pattern", [
+    ("contains", "li"), ("startswith", "Al"), ("endswith", "ie"),
+])
+def test_filter_text_arrow_string_column(mode, pattern):
+    """filter_text should match the object result on a string[pyarrow] column."""
+    pytest.importorskip("pyarrow")
+    df = pd.DataFrame({"name": ["Alice", "Bob", None, "Charlie"]})
+    arrow_df = df.astype({"name": "string[pyarrow]"})
+    result = filter_text(arrow_df, "name", mode, pattern)
+    assert result.index.tolist() == filter_text(df, "name", mode, pattern).index.tolist()
+
+
 def test_filter_text_with_invalid_mode(simple_df):
     """filter_text should raise ValueError if mode is not supported."""
     with pytest.raises(ValueError):
@@ -174,9 +394,22 @@ def test_rolling_stat_mean(simple_df):
 
 
 def test_filter_rows(simple_df):
-    df2 = filter_rows(simple_df, lambda row: row["a"] > 1)
+    df2 = filter_rows(simple_df, lambda df: df["a"] > 1)
     assert df2["a"].tolist() == [2, 3]
 
+
+def test_filter_rows_with_text_predicate():
+    df = pd.DataFrame({"name": ["Ann", "Bob", "Alice"]})
+    df2 = filter_rows(df, lambda df: df["name"].str.startswith("A"))
+    assert df2["name"].tolist() == ["Ann", "Alice"]
+
+
+def test_filter_rows_row_wise_predicate_is_deprecated(simple_df):
+    """filter_rows should still apply single-row predicates, with a warning."""
+    with pytest.warns(DeprecationWarning):
+        df2 = filter_rows(simple_df, lambda row: row["a"] > 1 and row["b"] < 6)
+    assert df2["a"].tolist() == [2]
+
 def test_resample_time_series_multi_agg():
     """resample_time_series multi-column aggregation"""
     dates = pd.date_range("2023-01-01", periods=4, freq="D")
@@ -197,6 +430,18 @@ def test_resample_time_series_multi_agg():
     assert res["v1"].iloc[0] == 10
     assert res["v2"].iloc[0] == 25
 
+
+def test_resample_time_series_unsorted_strings():
+    """resample_time_series should parse and order an unsorted text column."""
+    df = pd.DataFrame({
+        "ts": ["2023-01-09", "2023-01-01", "2023-01-02"],
+        "v": [5, 1, 2],
+        "note": ["x", "y", "z"]
+    })
+    res = resample_time_series(df, "ts", "W", {"v": "sum"})
+    assert res["v"].tolist() == [3, 5]
+    assert df["ts"].dtype == object
+
 def test_rolling_stat_std(simple_df):
     """rolling_stat std"""
     series = rolling_stat(simple_df, "a", window=2, func="std")
@@ -207,3 +452,24 @@ def test_filter_text_endswith():
     df = pd.DataFrame({"city": ["Berlin", "Paris", "Turin"]})
     result = filter_text(df, "city", "endswith", "in")
     assert result["city"].tolist() == ["Berlin", "Turin"]
+
+
+@pytest.mark.parametrize("func", ["median", "var"])
+def test_rolling_stat_matches_pandas(simple_df, func):
+    """rolling_stat should dispatch to the pandas rolling method of that name."""
+    series = rolling_stat(simple_df, "a", window=2, func=func)
+    expected = getattr(simple_df["a"].rolling(2), func)()
+    pd.testing.assert_series_equal(series, expected)
+
+
+def test_rolling_stat_numba_engine(simple_df):
+    """rolling_stat with engine='numba' should match the default engine."""
+    pytest.importorskip("numba")
+    series = rolling_stat(simple_df, "a", window=2, func="mean", engine="numba")
+    pd.testing.assert_series_equal(series, rolling_stat(simple_df, "a", window=2))
+
+
+def test_rolling_stat_invalid_func(simple_df):
+    """rolling_stat should raise ValueError for an unknown function."""
+    with pytest.raises(ValueError):
+        rolling_stat(simple_df, "a", window=2, func="apply")
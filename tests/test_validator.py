@@ -70,6 +70,11 @@ def test_validate_column_types_missing_column(valid_df):
     with pytest.raises(KeyError):
         validator.validate_column_types(valid_df, {"missing": "int64"})
 
+def test_validate_column_types_accepts_dtype_aliases(valid_df):
+    """validate_column_types should accept dtype aliases such as 'i8' and 'category'."""
+    df = valid_df.astype({"name": "category"})
+    assert validator.validate_column_types(df, {"id": "i8", "name": "category"})
+
 # --- validate_unique tests ---------------------------------------------------
 
 def test_validate_unique_passes(valid_df):
@@ -84,6 +89,13 @@ def test_validate_unique_raises():
         validator.validate_unique(df, ["id"])
 
 
+def test_validate_unique_float_column_treats_nan_as_duplicate():
+    """validate_unique on a float column should count repeated NaN as duplicates."""
+    assert validator.validate_unique(pd.DataFrame({"x": [0.5, 1.5, float("nan")]}), ["x"])
+    with pytest.raises(ValueError):
+        validator.validate_unique(pd.DataFrame({"x": [0.5, float("nan"), float("nan")]}), ["x"])
+
+
 # --- validate_value_ranges tests ---------------------------------------------
 
 def test_validate_value_ranges_within_bounds(valid_df):
@@ -103,6 +115,14 @@ def test_validate_value_ranges_above_max(valid_df):
         validator.validate_value_ranges(valid_df, "age", max_value=35)
 
 
+def test_validate_value_ranges_ignores_nan():
+    """validate_value_ranges should skip missing values when checking bounds."""
+    df = pd.DataFrame({"x": [float("nan"), 1.0, 5.0]})
+    assert validator.validate_value_ranges(df, "x", min_value=1, max_value=5)
+    with pytest.raises(ValueError):
+        validator.validate_value_ranges(df, "x", min_value=2)
+
+
 # --- validate_schema tests ---------------------------------------------------
 
 def test_validate_schema_passes(valid_df):
@@ -115,6 +135,12 @@ def test_validate_schema_raises(valid_df):
     with pytest.raises(ValueError):
         validator.validate_schema(valid_df, ["id", "age"])
 
+
+def test_validate_schema_reports_missing_and_extra_columns(valid_df):
+    """validate_schema error should name both missing and unexpected columns."""
+    with pytest.raises(ValueError, match=r"Missing: \['score'\].*Unexpected: \['name'\]"):
+        validator.validate_schema(valid_df, ["id", "age", "score"])
+
 def test_validate_allowed_values_passes(valid_df):
     """validate_no_missing passes when selecting subset"""
     assert validator.validate_allowed_values(valid_df, "name", {"Alice", "Bob", "Charlie"})
@@ -124,6 +150,10 @@ def test_validate_allowed_values_raises(valid_df):
     with pytest.raises(ValueError):
         validator.validate_allowed_values(valid_df, "name", {"Alice", "Bob"})
 
+def test_validate_allowed_values_ignores_missing(df_with_missing):
+    """validate_allowed_values should not report missing values as disallowed."""
+    assert validator.validate_allowed_values(df_with_missing, "age", {25, 40})
+
 def test_validate_unique_multiple_columns():
     """validate_unique multiple columns"""
     df = pd.DataFrame({"id": [1, 2, 1], "code": [5, 5, 5]})